@@ -0,0 +1,220 @@
+"""
+사용자 데이터 내보내기 (책장, 독서 노트, AI 독후감, 포인트 내역)
+
+계정 크기와 상관없이 메모리를 일정하게 쓰도록 queryset.iterator()로 조금씩 읽어서
+JSONL / CSV / Markdown 문자열 조각을 바로 흘려보내고, zip도 스트리밍으로 만듦
+"""
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+from io import StringIO
+import csv
+import json
+import zipfile
+from books.models import UserBook
+from chat.models import BookReview
+from reading.models import ReadingNote
+from rewards.models import PointHistory
+
+
+CHUNK_SIZE = 500
+# 응답으로 내보낼 때 한 번에 모아서 보내는 크기
+BUFFER_SIZE = 64 * 1024
+
+EXPORT_FORMATS = {
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'csv': ('text/csv', 'csv'),
+    'md': ('text/markdown', 'md'),
+}
+
+# 섹션 이름 -> 내보낼 필드
+SECTIONS = {
+    'books': [
+        'id', 'external_book_id', 'book_title', 'book_author', 'status',
+        'current_page', 'total_pages', 'start_date', 'end_date', 'created_at', 'updated_at',
+    ],
+    'notes': ['id', 'user_book_id', 'book_title', 'page_number', 'note_content', 'created_at'],
+    'reviews': [
+        'id', 'user_book_id', 'book_title', 'rating',
+        'liked_point', 'disliked_point', 'review_content', 'created_at',
+    ],
+    'points': ['id', 'transaction_type', 'points', 'reason', 'created_at'],
+}
+
+
+def get_section_queryset(user, section):
+    if section == 'books':
+        queryset = UserBook.objects.filter(user=user).order_by('id')
+    elif section == 'notes':
+        queryset = ReadingNote.objects.filter(user_book__user=user).order_by('user_book_id', 'page_number', 'id')
+    elif section == 'reviews':
+        queryset = BookReview.objects.filter(user_book__user=user).order_by('user_book_id')
+    else:
+        queryset = PointHistory.objects.filter(user=user).order_by('id')
+    if section in ('notes', 'reviews'):
+        queryset = queryset.annotate(book_title=F('user_book__book_title'))
+    return queryset.values(*SECTIONS[section])
+
+
+def iter_section(user, section):
+    return get_section_queryset(user, section).iterator(chunk_size=CHUNK_SIZE)
+
+
+def iter_jsonl(user):
+    for section in SECTIONS:
+        for row in iter_section(user, section):
+            yield json.dumps({'type': section, **row}, ensure_ascii=False, cls=DjangoJSONEncoder) + '\n'
+
+
+def _csv_line(writer, buffer, row):
+    writer.writerow(row)
+    line = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return line
+
+
+def iter_csv(user, sections=None):
+    """
+    여러 섹션을 CSV 하나로 내보냄 (type 컬럼 + 모든 섹션 필드의 합집합)
+    엑셀에서 한글이 깨지지 않도록 BOM을 붙임
+    """
+    sections = sections or list(SECTIONS)
+    columns = []
+    for section in sections:
+        columns.extend(field for field in SECTIONS[section] if field not in columns)
+    if len(sections) > 1:
+        columns = ['type'] + columns
+
+    buffer = StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    yield '\ufeff' + _csv_line(writer, buffer, dict(zip(columns, columns)))
+    for section in sections:
+        for row in iter_section(user, section):
+            if len(sections) > 1:
+                row['type'] = section
+            yield _csv_line(writer, buffer, row)
+
+
+def iter_markdown(user):
+    """책별로 노트와 독후감을 묶은 Markdown (책과 노트를 같은 순서로 읽으며 병합)"""
+    yield f'# {user.nickname or user.username}님의 독서 기록\n\n'
+    yield f'내보낸 시각: {timezone.localtime():%Y-%m-%d %H:%M}\n\n'
+
+    notes = iter_section(user, 'notes')
+    note = next(notes, None)
+    books = (
+        UserBook.objects.filter(user=user)
+        .select_related('ai_review')
+        .order_by('id')
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+    for book in books:
+        yield f'## {book.book_title}\n\n'
+        if book.book_author:
+            yield f'- 저자: {book.book_author}\n'
+        yield f'- 상태: {book.get_status_display()}\n'
+        yield f'- 진행: {book.current_page}/{book.total_pages}페이지\n\n'
+
+        # 앞선 책(삭제된 책 등)에 남은 노트는 건너뜀
+        while note is not None and note['user_book_id'] < book.id:
+            note = next(notes, None)
+        if note is not None and note['user_book_id'] == book.id:
+            yield '### 독서 노트\n\n'
+            while note is not None and note['user_book_id'] == book.id:
+                content = note['note_content'].strip().replace('\n', '\n  ')
+                yield f"- **{note['page_number']}페이지**: {content}\n"
+                note = next(notes, None)
+            yield '\n'
+
+        try:
+            review = book.ai_review
+        except BookReview.DoesNotExist:
+            review = None
+        if review is not None:
+            yield f'### 독후감 ({review.rating}점)\n\n{review.review_content.strip()}\n\n'
+
+    yield '## 포인트 내역\n\n'
+    for row in iter_section(user, 'points'):
+        sign = '+' if row['transaction_type'] == 'earn' else '-'
+        yield f"- {timezone.localtime(row['created_at']):%Y-%m-%d} {sign}{row['points']}P {row['reason']}\n"
+
+
+def iter_export(user, fmt):
+    if fmt == 'jsonl':
+        return iter_jsonl(user)
+    if fmt == 'csv':
+        return iter_csv(user)
+    return iter_markdown(user)
+
+
+def _buffered(chunks):
+    """작은 문자열 조각을 BUFFER_SIZE 정도로 모아서 bytes로 반환"""
+    pending = []
+    size = 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8')
+        pending.append(data)
+        size += len(data)
+        if size >= BUFFER_SIZE:
+            yield b''.join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield b''.join(pending)
+
+
+class _ZipStream:
+    """ZipFile이 쓴 바이트를 모아뒀다가 꺼내가는 쓰기 전용 파일 (seek 불가)"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _zip_members(user, fmt):
+    """zip 안에 넣을 (파일 이름, 내용 조각) 목록, CSV는 섹션별로 나눔"""
+    if fmt == 'csv':
+        return [(f'{section}.csv', iter_csv(user, [section])) for section in SECTIONS]
+    return [(f'export.{EXPORT_FORMATS[fmt][1]}', iter_export(user, fmt))]
+
+
+def iter_zip(user, fmt):
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, chunks in _zip_members(user, fmt):
+            with archive.open(name, 'w', force_zip64=True) as member:
+                for data in _buffered(chunks):
+                    member.write(data)
+                    yield stream.pop()
+    yield stream.pop()
+
+
+def stream_export(user, fmt, zipped=False):
+    """내보내기 파일 내용을 bytes 조각으로 반환"""
+    if zipped:
+        return (data for data in iter_zip(user, fmt) if data)
+    return _buffered(iter_export(user, fmt))
+
+
+def get_filename(user, fmt, zipped=False):
+    extension = 'zip' if zipped else EXPORT_FORMATS[fmt][1]
+    return f'bookflower-{user.username}-{timezone.localdate():%Y%m%d}.{extension}'
+
+
+def get_content_type(fmt, zipped=False):
+    if zipped:
+        return 'application/zip'
+    return f'{EXPORT_FORMATS[fmt][0]}; charset=utf-8'
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rewards.models import UserPoint, ReadingStreak
+from sunflower.models import SunflowerGrowth
+
+
+class Command(BaseCommand):
+    help = '기존 사용자에게 없는 해바라기/포인트/연속 독서 기록을 생성'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 생성할 행 수')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        batch_size = options['batch_size']
+
+        for model in (SunflowerGrowth, UserPoint, ReadingStreak):
+            missing = User.objects.exclude(
+                id__in=model.objects.values('user_id')
+            ).values_list('id', flat=True)
+            rows = [model(user_id=user_id) for user_id in missing]
+            model.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+            self.stdout.write(f'{model.__name__}: {len(rows)}개 생성')
+
+        self.stdout.write(self.style.SUCCESS('사용자 기본 데이터 생성 완료'))
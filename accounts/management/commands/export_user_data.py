@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+import sys
+from accounts.exports import EXPORT_FORMATS, stream_export, get_filename
+
+
+class Command(BaseCommand):
+    help = '사용자 데이터(책장, 독서 노트, 독후감, 포인트 내역) 내보내기'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='내보낼 사용자 이름')
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='jsonl', help='내보낼 형식')
+        parser.add_argument('--zip', action='store_true', help='zip으로 압축')
+        parser.add_argument('--output', default=None, help="저장할 파일 경로 ('-'이면 표준출력, 기본: 자동 생성)")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"사용자를 찾을 수 없습니다: {options['username']}")
+
+        fmt = options['format']
+        zipped = options['zip']
+        output = options['output'] or get_filename(user, fmt, zipped)
+
+        if output == '-':
+            for data in stream_export(user, fmt, zipped):
+                sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+            return
+
+        size = 0
+        with open(output, 'wb') as f:
+            for data in stream_export(user, fmt, zipped):
+                f.write(data)
+                size += len(data)
+
+        self.stdout.write(self.style.SUCCESS(f'내보내기 완료: {output} ({size:,}바이트)'))
@@ -1,9 +1,12 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth import login
+from django.contrib.auth.decorators import login_required
+from django.http import StreamingHttpResponse, HttpResponseBadRequest
 from django.contrib import messages
 from django.contrib.auth.forms import UserCreationForm
 from django import forms
 from .models import User
+from .exports import EXPORT_FORMATS, stream_export, get_filename, get_content_type
 
 
 class SignUpForm(UserCreationForm):
@@ -54,3 +57,22 @@ def signup(request):
         form = SignUpForm()
 
     return render(request, 'accounts/signup.html', {'form': form})
+
+
+@login_required
+def export_data(request):
+    """
+    내 데이터 내보내기 (책장, 독서 노트, 독후감, 포인트 내역)
+    ?format=jsonl|csv|md, ?zip=1이면 zip으로 압축
+    """
+    fmt = request.GET.get('format', 'jsonl')
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponseBadRequest('지원하지 않는 형식입니다.')
+    zipped = request.GET.get('zip') == '1'
+
+    response = StreamingHttpResponse(
+        stream_export(request.user, fmt, zipped),
+        content_type=get_content_type(fmt, zipped),
+    )
+    response['Content-Disposition'] = f'attachment; filename="{get_filename(request.user, fmt, zipped)}"'
+    return response
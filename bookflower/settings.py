@@ -88,6 +88,8 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 트랜잭션 시작 시 쓰기 잠금을 잡아서 동시 요청이 잠금 오류 대신 차례로 처리되게 함
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
     }
 }
 
@@ -152,6 +154,63 @@ DATA4LIBRARY_API_KEY = 'ea3fe050d4c2224c435c76e37816b1ea36426314855efc85af89b072
 
 # 알라딘 API 설정
 ALADIN_TTB_KEY = os.getenv('ALADIN_TTB_KEY', 'ttbalxh78950107001')
+ALADIN_CONNECT_TIMEOUT = 3  # 연결 타임아웃 (초)
+ALADIN_READ_TIMEOUT = 5  # 읽기 타임아웃 (초)
+ALADIN_MAX_RETRIES = 2  # GET 요청 재시도 횟수
+ALADIN_MAX_CONCURRENCY = 8  # 프로세스당 동시 요청 수 제한
+ALADIN_BREAKER_FAILURE_THRESHOLD = 5  # 연속 실패 몇 번이면 차단할지
+ALADIN_BREAKER_COOLDOWN = 30  # 차단 유지 시간 (초)
+ALADIN_IMAGE_MAX_CONCURRENCY = 8  # 표지 이미지 동시 요청 수 제한 (API와 별도)
+
+# 캐시: 운영에서는 REDIS_URL을 설정해서 모든 워커 프로세스가 같은 캐시를 보게 함
+# 설정하지 않으면 개발용 LocMemCache (프로세스별이라 검색/대시보드 통계 카운터가 워커마다 따로 집계됨)
+# 대시보드 무효화 버전은 DB(SunflowerGrowth)에 있으므로 어느 백엔드든 워커 간에 맞게 동작
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# 도서 카탈로그 캐시 유효 기간 (일)
+BOOK_CATALOG_TTL_DAYS = int(os.getenv('BOOK_CATALOG_TTL_DAYS', 30))
+BOOK_CATALOG_NEGATIVE_TTL = 60 * 5  # 조회 실패한 ISBN 재시도 대기 시간 (초)
+PAGE_COUNT_ENRICH_BATCH_SIZE = 50  # 백그라운드 페이지 수 조회 배치 크기
+
+# 도서 검색 결과 캐시 (초): 신선 기간이 지나면 오래된 결과를 보여주면서 백그라운드 갱신
+BOOK_SEARCH_CACHE_TTL = 60 * 10
+BOOK_SEARCH_CACHE_STALE_TTL = 60 * 60 * 24
+
+# 로컬 카탈로그 우선 검색: 결과가 이 개수 이상이면 알라딘을 호출하지 않음
+BOOK_SEARCH_LOCAL_FIRST = True
+BOOK_SEARCH_LOCAL_MIN_RESULTS = 5
+
+# 표지 이미지 로컬 캐시
+BOOK_COVER_CACHE_DIR = BASE_DIR / 'cache' / 'covers'
+BOOK_COVER_CACHE_MAX_BYTES = 500 * 1024 * 1024  # 500MB 초과 시 오래 안 쓴 파일부터 삭제
+BOOK_COVER_MAX_AGE = 60 * 60 * 24 * 7  # 브라우저 캐시 유지 시간 (초)
+
+# 책 제목 자동완성 인덱스 증분 갱신 주기 (초)
+BOOK_AUTOCOMPLETE_REFRESH_INTERVAL = 60
+
+# 홈 대시보드 조각 캐시 유지 시간 (초, 책장/노트가 바뀌면 바로 무효화됨)
+SUNFLOWER_DASHBOARD_CACHE_TTL = 60 * 60
+
+# 변경 피드 API에서 삭제 기록(tombstone)을 보관하는 기간 (일), 이보다 오래된 cursor는 전체를 다시 받음
+SYNC_TOMBSTONE_RETENTION_DAYS = 90
+
+# 오프라인 동기화 API에서 처리한 작업 키를 보관하는 기간 (일), 이 기간 안에 다시 보낸 작업만 duplicate로 걸러냄
+SYNC_OPERATION_RETENTION_DAYS = 30
+
+# 동일한 검색/조회 요청 합치기를 프로세스 간에도 적용할지 (공유 캐시 백엔드 필요)
+BOOK_SINGLEFLIGHT_CROSS_PROCESS = False
 
 # OpenAI API 설정
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -1,3 +1,10 @@
 from django.contrib import admin
+from .models import Book
 
-# Register your models here.
+
+@admin.register(Book)
+class BookAdmin(admin.ModelAdmin):
+    list_display = ['isbn13', 'title', 'authors', 'publisher', 'page_count', 'fetched_at']
+    list_filter = ['fetched_at']
+    search_fields = ['isbn13', 'title', 'authors']
+    readonly_fields = ['created_at', 'updated_at']
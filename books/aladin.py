@@ -0,0 +1,330 @@
+from django.conf import settings
+from django.db.models import Q
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+import xml.etree.ElementTree as ET
+from . import search_index
+from .models import Book
+from .parsers import parse_search_response, parse_lookup_response
+
+
+ALADIN_API_BASE_URL = "http://www.aladin.co.kr/ttb/api/"
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class AladinBusyError(requests.RequestException):
+    """동시 요청 수 제한에 걸린 경우"""
+
+
+class AladinCircuitOpenError(requests.RequestException):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않은 경우"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 threshold번 쌓이면 cooldown초 동안 요청을 차단(open)하고,
+    이후 한 번의 시험 요청(half-open)이 성공하면 다시 닫음(closed)
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, cooldown=30):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trip_count = 0
+        self.short_circuit_count = 0
+        self.probe_in_flight = False
+
+    def allow_request(self):
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+
+            # half-open 상태에서는 한 번에 하나의 시험 요청만 허용
+            if self.state == self.HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+
+            self.short_circuit_count += 1
+            return False
+
+    def release_probe(self):
+        """요청을 보내지 못한 경우 시험 요청 기회를 반납"""
+        with self.lock:
+            self.probe_in_flight = False
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            self.probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trip_count += 1
+                    print(f"⚠️ Aladin circuit breaker opened after {self.consecutive_failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'trip_count': self.trip_count,
+                'short_circuit_count': self.short_circuit_count,
+                'open_for_seconds': round(time.monotonic() - self.opened_at, 1) if self.opened_at else 0,
+            }
+
+
+class AladinClient:
+    """
+    알라딘 API 공용 HTTP 클라이언트
+    - keep-alive 커넥션 풀 재사용
+    - 연결/읽기 타임아웃 분리
+    - GET 요청 재시도 (지터가 있는 지수 백오프)
+    - 프로세스 전체 동시 요청 수 제한
+    - 장애 시 서킷 브레이커로 즉시 실패 처리
+    """
+
+    def __init__(self, connect_timeout=3, read_timeout=5, max_retries=2,
+                 backoff=0.3, max_concurrency=8, pool_size=10, breaker=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, endpoint, params):
+        """API 호출 후 응답 본문(bytes) 반환"""
+        return self.get_url(ALADIN_API_BASE_URL + endpoint, params)
+
+    def get_url(self, url, params=None):
+        """알라딘 URL(API, 표지 이미지 등)을 호출해 응답 본문(bytes) 반환"""
+        if not self.breaker.allow_request():
+            raise AladinCircuitOpenError("Aladin circuit breaker is open")
+
+        # 슬롯이 나지 않으면 오래 기다리지 않고 실패 처리
+        if not self.semaphore.acquire(timeout=self.timeout[1]):
+            self.breaker.release_probe()
+            raise AladinBusyError("Too many concurrent Aladin requests")
+
+        try:
+            content = self._get_with_retry(url, params)
+        except (requests.ConnectionError, requests.Timeout):
+            self.breaker.record_failure()
+            raise
+        except requests.HTTPError as e:
+            # 4xx는 요청 문제이므로 장애로 보지 않음
+            if e.response is not None and e.response.status_code in RETRY_STATUS_CODES:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except Exception:
+            self.breaker.release_probe()
+            raise
+        finally:
+            self.semaphore.release()
+
+        self.breaker.record_success()
+        return content
+
+    def _get_with_retry(self, url, params):
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.content
+                error = requests.HTTPError(f"{response.status_code} from Aladin", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            if attempt == self.max_retries:
+                raise error
+            # full jitter: 0 ~ backoff * 2^(attempt+1) 초 대기
+            time.sleep(random.uniform(0, self.backoff * (2 ** (attempt + 1))))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """설정값으로 만든 공용 AladinClient 반환"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AladinClient(
+                    connect_timeout=getattr(settings, 'ALADIN_CONNECT_TIMEOUT', 3),
+                    read_timeout=getattr(settings, 'ALADIN_READ_TIMEOUT', 5),
+                    max_retries=getattr(settings, 'ALADIN_MAX_RETRIES', 2),
+                    max_concurrency=getattr(settings, 'ALADIN_MAX_CONCURRENCY', 8),
+                    breaker=CircuitBreaker(
+                        failure_threshold=getattr(settings, 'ALADIN_BREAKER_FAILURE_THRESHOLD', 5),
+                        cooldown=getattr(settings, 'ALADIN_BREAKER_COOLDOWN', 30),
+                    ),
+                )
+    return _client
+
+
+_image_client = None
+
+
+def get_image_client():
+    """
+    표지 이미지(image.aladin.co.kr)용 AladinClient 반환
+    이미지 CDN 장애나 표지 요청이 몰려도 API 호출에 영향이 없도록 서킷 브레이커와 동시 요청 수 제한을 따로 둠
+    """
+    global _image_client
+    if _image_client is None:
+        with _client_lock:
+            if _image_client is None:
+                _image_client = AladinClient(
+                    connect_timeout=getattr(settings, 'ALADIN_CONNECT_TIMEOUT', 3),
+                    read_timeout=getattr(settings, 'ALADIN_READ_TIMEOUT', 5),
+                    max_retries=getattr(settings, 'ALADIN_MAX_RETRIES', 2),
+                    max_concurrency=getattr(settings, 'ALADIN_IMAGE_MAX_CONCURRENCY', 8),
+                    breaker=CircuitBreaker(
+                        failure_threshold=getattr(settings, 'ALADIN_BREAKER_FAILURE_THRESHOLD', 5),
+                        cooldown=getattr(settings, 'ALADIN_BREAKER_COOLDOWN', 30),
+                    ),
+                )
+    return _image_client
+
+
+def search_books_api(query, page_no=1):
+    """
+    알라딘 API를 사용한 도서 검색
+    """
+    if not query:
+        return []
+
+    try:
+        # API 키 확인
+        ttb_key = getattr(settings, 'ALADIN_TTB_KEY', None)
+        if not ttb_key:
+            print("⚠️ Aladin TTB key not configured properly")
+            return get_fallback_books(query)
+
+        params = {
+            'ttbkey': ttb_key,
+            'Query': query,
+            'QueryType': 'Keyword',
+            'MaxResults': 10,
+            'start': page_no,
+            'SearchTarget': 'Book',
+            'output': 'xml',
+            'Version': '20131101'
+        }
+
+        # API 호출 및 XML 파싱 (스트리밍)
+        content = get_client().get('ItemSearch.aspx', params)
+        return [record.to_dict() for record in parse_search_response(content)]
+
+    except AladinCircuitOpenError:
+        # 장애 중에는 알라딘을 호출하지 않고 카탈로그에 저장된 도서로 응답
+        return search_catalog_fallback(query) or get_fallback_books(query)
+
+    except requests.RequestException as e:
+        print(f"API request error: {e}")
+        return search_catalog_fallback(query) or get_fallback_books(query)
+
+    except ET.ParseError as e:
+        print(f"XML parsing error: {e}")
+        return get_fallback_books(query)
+
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        return get_fallback_books(query)
+
+
+def get_book_details(isbn):
+    """
+    알라딘 ItemLookUp API를 사용해서 개별 도서의 상세 정보 가져오기
+    페이지 수 정보를 포함
+    """
+    try:
+        ttb_key = getattr(settings, 'ALADIN_TTB_KEY', None)
+        if not ttb_key:
+            return None
+
+        # ItemLookUp API 파라미터 구성
+        params = {
+            'ttbkey': ttb_key,
+            'itemIdType': 'ISBN13',
+            'ItemId': isbn,
+            'output': 'xml',
+            'Version': '20131101',
+            'OptResult': 'ebookList,usedList,reviewList'
+        }
+
+        content = get_client().get('ItemLookUp.aspx', params)
+
+        # XML 파싱 (페이지 수는 subInfo > itemPage에서)
+        record = parse_lookup_response(content)
+        if record is None:
+            return None
+
+        return record.to_dict()
+
+    except Exception as e:
+        print(f"Error getting book details: {e}")
+        return None
+
+
+def search_catalog_fallback(query, limit=10):
+    """
+    알라딘 장애 시 카탈로그에 저장된 도서 중에서 검색
+    """
+    books = search_index.search(query, limit=limit)
+    if books is None:
+        books = Book.objects.filter(
+            Q(title__icontains=query) | Q(authors__icontains=query)
+        ).order_by('-updated_at')[:limit]
+    # 장애 중 임시 결과임을 표시 (검색 캐시에 저장하지 않도록)
+    return [dict(book.to_dict(), degraded=True) for book in books]
+
+
+def get_fallback_books(query):
+    """
+    API 오류 시 사용할 더미 데이터
+    """
+    return [
+        {
+            'id': f'fallback_{query}_1',
+            'title': f'🚨 API 연결 오류 - {query} 관련 샘플 도서',
+            'authors': ['샘플 저자'],
+            'description': f'⚠️ 도서관정보나루 API 연결에 문제가 있습니다. API 키를 확인하거나 네트워크 상태를 점검해주세요.',
+            'page_count': 250,
+            'thumbnail': None,
+            'published_date': '2024',
+            'publisher': 'API 오류',
+            'isbn': ''
+        }
+    ] if query else []
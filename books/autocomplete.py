@@ -0,0 +1,175 @@
+"""
+책 제목 자동완성 인덱스 (메모리)
+
+정렬된 배열 + bisect로 접두어 검색을 하므로 요청마다 DB를 조회하지 않음
+제목 원문과 초성(ㅎㄹㅍㅌ) 두 가지 키로 색인해서 초성 검색도 지원
+"""
+from bisect import bisect_left
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+import threading
+import time
+import unicodedata
+from .models import Book, UserBook
+
+
+CHOSUNG = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+]
+CHOSUNG_SET = set(CHOSUNG)
+HANGUL_START = 0xAC00
+HANGUL_END = 0xD7A3
+
+
+def normalize(text):
+    """공백을 없애고 NFC + casefold"""
+    return ''.join(unicodedata.normalize('NFC', text or '').casefold().split())
+
+
+def to_chosung(text):
+    """한글 음절을 초성으로 변환 (그 외 글자는 그대로)"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_START <= code <= HANGUL_END:
+            chars.append(CHOSUNG[(code - HANGUL_START) // 588])
+        else:
+            chars.append(ch)
+    return ''.join(chars)
+
+
+def has_chosung(text):
+    return any(ch in CHOSUNG_SET for ch in text)
+
+
+class AutocompleteIndex:
+    """
+    (키, 제목) 튜플을 정렬된 배열로 유지
+    - titles: 정규화한 제목 키
+    - chosung: 초성 키
+    weights에는 제목별 인기도(책장에 담은 사용자 수)를 저장
+    """
+
+    def __init__(self, refresh_interval=60, max_scan=200):
+        self.refresh_interval = refresh_interval
+        self.max_scan = max_scan
+        self.lock = threading.Lock()  # 새 배열로 바꿔 끼울 때만 잠깐 잡음
+        self.refresh_lock = threading.Lock()  # 갱신은 한 번에 하나만 (요청은 기다리지 않음)
+        self.titles = []
+        self.chosung = []
+        self.weights = {}
+        self.built = False
+        self.last_refreshed_at = None
+        self.last_checked = 0
+
+    def suggest(self, query, limit=10):
+        if not self.built:
+            # 요청 안에서 전체 인덱스를 만들지 않도록 백그라운드에서 만들고, 준비될 때까지는 빈 결과
+            self._refresh_in_background()
+            return []
+        self._maybe_refresh_in_background()
+
+        key = normalize(query)
+        if not key:
+            return []
+
+        # 갱신 중에 배열이 바뀌어도 같은 시점의 배열을 보도록 참조를 먼저 잡아둠
+        titles, chosung, weights = self.titles, self.chosung, self.weights
+        if has_chosung(key):
+            entries, key = chosung, to_chosung(key)
+        else:
+            entries = titles
+
+        candidates = []
+        seen = set()
+        start = bisect_left(entries, (key, ''))
+        for entry_key, title in entries[start:start + self.max_scan]:
+            if not entry_key.startswith(key):
+                break
+            if title not in seen:
+                seen.add(title)
+                candidates.append(title)
+
+        # 인기 있는 제목 우선, 같으면 짧은 제목 우선
+        candidates.sort(key=lambda title: (-weights.get(title, 0), len(title)))
+        return candidates[:limit]
+
+    def refresh(self):
+        """
+        처음에는 전체를 만들고, 이후에는 마지막 갱신 이후
+        추가/수정된 카탈로그 도서와 책장 도서만 반영 (증분 갱신)
+        새 배열은 잠금 없이 만들고(추가 후 정렬 한 번), 바꿔 끼울 때만 잠금
+        """
+        since = self.last_refreshed_at
+        started_at = timezone.now()
+
+        books = Book.objects.all()
+        user_books = UserBook.objects.all()
+        if since is not None:
+            books = books.filter(updated_at__gte=since)
+            user_books = user_books.filter(created_at__gte=since)
+
+        catalog_titles = list(books.values_list('title', flat=True))
+        shelf_titles = list(
+            user_books.values('book_title').annotate(readers=Count('id')).values_list('book_title', 'readers')
+        )
+
+        weights = dict(self.weights)
+        new_titles = []
+        new_chosung = []
+        for title, weight in [(title, 0) for title in catalog_titles] + shelf_titles:
+            title = (title or '').strip()
+            if not title:
+                continue
+            if title not in weights:
+                key = normalize(title)
+                new_titles.append((key, title))
+                new_chosung.append((to_chosung(key), title))
+                weights[title] = 0
+            weights[title] += weight
+
+        titles = self.titles
+        chosung = self.chosung
+        if new_titles:
+            # 이미 정렬된 기존 배열 뒤에 붙여 정렬하므로 증분 갱신은 거의 선형
+            titles = titles + new_titles
+            titles.sort()
+            chosung = chosung + new_chosung
+            chosung.sort()
+
+        with self.lock:
+            self.titles = titles
+            self.chosung = chosung
+            self.weights = weights
+            self.last_refreshed_at = started_at
+            self.last_checked = time.monotonic()
+            self.built = True
+
+    def _maybe_refresh_in_background(self):
+        if time.monotonic() - self.last_checked < self.refresh_interval:
+            return
+        self._refresh_in_background()
+
+    def _refresh_in_background(self):
+        if not self.refresh_lock.acquire(blocking=False):
+            return
+        self.last_checked = time.monotonic()
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Autocomplete refresh error: {e}")
+            finally:
+                self.refresh_lock.release()
+                connection.close()
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+autocomplete_index = AutocompleteIndex(
+    refresh_interval=getattr(settings, 'BOOK_AUTOCOMPLETE_REFRESH_INTERVAL', 60),
+)
@@ -0,0 +1,156 @@
+"""
+책 표지 이미지 로컬 캐시
+
+알라딘 표지를 한 번만 받아서 내용 해시(sha256) 이름으로 디스크에 저장하고,
+크기/포맷별로 줄인 이미지를 미리 만들어 둠
+
+cache/covers/
+├── urls/<url sha1>            원본 URL -> 내용 해시
+├── originals/<content sha256> 원본 이미지
+└── variants/<hash>_<size>.<fmt> 크기 조절한 이미지
+"""
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlparse
+from django.conf import settings
+import hashlib
+import os
+import tempfile
+from PIL import Image
+from .aladin import get_image_client
+
+
+# 변형 이름 -> 최대 너비(px), 화면 표시 크기의 2배 (고해상도 화면 대응)
+COVER_SIZES = {
+    'thumb': 160,
+    'medium': 320,
+}
+COVER_FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpg': ('JPEG', 'image/jpeg'),
+}
+ALLOWED_HOSTS = ('image.aladin.co.kr',)
+
+
+def get_cache_dir():
+    return Path(getattr(settings, 'BOOK_COVER_CACHE_DIR', settings.BASE_DIR / 'cache' / 'covers'))
+
+
+def is_allowed_url(url):
+    host = urlparse(url or '').hostname or ''
+    return any(host == allowed or host.endswith('.' + allowed) for allowed in ALLOWED_HOSTS)
+
+
+def _write_atomic(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _touch(path):
+    # 최근 사용 시각을 mtime에 기록 (LRU 정리에 사용)
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _url_path(url):
+    return get_cache_dir() / 'urls' / hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def _variant_path(content_hash, size, fmt):
+    return get_cache_dir() / 'variants' / f'{content_hash}_{size}.{fmt}'
+
+
+def get_original(url):
+    """
+    원본 이미지의 내용 해시를 반환 (처음이면 알라딘에서 받아 저장)
+    """
+    url_path = _url_path(url)
+    originals_dir = get_cache_dir() / 'originals'
+
+    if url_path.exists():
+        content_hash = url_path.read_text().strip()
+        if (originals_dir / content_hash).exists():
+            return content_hash
+
+    content = get_image_client().get_url(url)
+    content_hash = hashlib.sha256(content).hexdigest()
+    original_path = originals_dir / content_hash
+    if not original_path.exists():
+        _write_atomic(original_path, content)
+    _write_atomic(url_path, content_hash.encode('ascii'))
+    return content_hash
+
+
+def get_variant(url, size, fmt):
+    """
+    크기/포맷에 맞게 줄인 표지 이미지 경로와 내용 해시 반환
+    """
+    # 이미 만들어 둔 변형이 있으면 원본 없이도 바로 사용
+    url_path = _url_path(url)
+    if url_path.exists():
+        content_hash = url_path.read_text().strip()
+        variant_path = _variant_path(content_hash, size, fmt)
+        if variant_path.exists():
+            _touch(variant_path)
+            return variant_path, content_hash
+
+    content_hash = get_original(url)
+    variant_path = _variant_path(content_hash, size, fmt)
+    original_path = get_cache_dir() / 'originals' / content_hash
+
+    width = COVER_SIZES[size]
+    with Image.open(original_path) as image:
+        image.thumbnail((width, width * 2), Image.LANCZOS)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        buffer = BytesIO()
+        pil_format, _ = COVER_FORMATS[fmt]
+        if pil_format == 'JPEG':
+            image.save(buffer, pil_format, quality=85, optimize=True, progressive=True)
+        else:
+            image.save(buffer, pil_format, quality=80, method=4)
+
+    _write_atomic(variant_path, buffer.getvalue())
+    _touch(original_path)
+    return variant_path, content_hash
+
+
+def sweep(max_bytes):
+    """
+    캐시 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 삭제
+    (삭제한 파일 수, 정리 후 크기) 반환
+    """
+    cache_dir = get_cache_dir()
+    files = []
+    total = 0
+    for subdir in ('variants', 'originals'):
+        directory = cache_dir / subdir
+        if not directory.exists():
+            continue
+        for path in directory.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+    removed = 0
+    files.sort()
+    for mtime, size, path in files:
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        total -= size
+        removed += 1
+    return removed, total
+
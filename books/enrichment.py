@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Least
+from django.utils import timezone
+import queue
+import threading
+from sunflower.services import SunflowerService, DashboardService
+from .models import UserBook
+from .services import CatalogService
+
+
+class PageCountEnricher:
+    """
+    페이지 수를 아직 모르는 UserBook을 백그라운드에서 채워 넣는 작업자
+    잠시 동안 들어온 ISBN을 모아서(중복 제거) 한 번에 조회하고,
+    같은 ISBN을 가진 모든 UserBook을 UPDATE 한 번으로 갱신함
+    """
+
+    def __init__(self, batch_size=50, batch_wait=0.5, max_workers=4):
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_workers = max_workers
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def enqueue(self, isbn):
+        self.queue.put(isbn)
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            isbns = self._next_batch()
+            try:
+                enrich_isbns(isbns, max_workers=self.max_workers)
+            except Exception as e:
+                print(f"Page count enrichment error: {e}")
+            finally:
+                connection.close()
+
+    def _next_batch(self):
+        # 첫 ISBN이 들어올 때까지 대기한 뒤, batch_wait 동안 더 모음
+        isbns = {self.queue.get()}
+        while len(isbns) < self.batch_size:
+            try:
+                isbns.add(self.queue.get(timeout=self.batch_wait))
+            except queue.Empty:
+                break
+        return isbns
+
+
+def enrich_isbns(isbns, max_workers=4):
+    """
+    ISBN 목록의 페이지 수를 카탈로그(없으면 ItemLookUp)에서 가져와
+    대기 중인 UserBook에 반영하고, 반영한 책 수를 반환
+    """
+    isbns = list(isbns)
+    if not isbns:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        books = list(executor.map(_lookup, isbns))
+
+    updated = 0
+    for isbn, book in zip(isbns, books):
+        if book is None or book.page_count <= 0:
+            # 조회 실패 시 대기 상태로 남겨두고 다음 배치에서 다시 시도
+            continue
+        with transaction.atomic():
+            pending = UserBook.objects.select_for_update().filter(
+                external_book_id=isbn,
+                page_count_pending=True,
+            )
+            # 완독 상태로 가져온 책은 0페이지로 들어가 있으므로 끝까지 읽은 것으로 채우고,
+            # 페이지 수를 모를 때 입력한 진행 상황이 실제 페이지 수보다 크면 줄임 (해바라기도 같은 만큼 조정)
+            adjusted = list(
+                pending.filter(Q(status='completed') | Q(current_page__gt=book.page_count))
+                .select_related('user').only('user', 'status', 'current_page')
+            )
+            user_ids = set(pending.values_list('user_id', flat=True))
+            now = timezone.now()
+            pending.filter(status='completed').update(current_page=book.page_count)
+            updated += pending.update(
+                current_page=Least(F('current_page'), book.page_count),
+                total_pages=book.page_count,
+                page_count_pending=False,
+                updated_at=now,
+            )
+            for user_book in adjusted:
+                SunflowerService.apply_page_delta(user_book.user, book.page_count - user_book.current_page)
+
+        # update()는 시그널을 보내지 않으므로 홈 대시보드 캐시를 직접 무효화
+        for user_id in user_ids:
+            DashboardService.invalidate(user_id)
+    return updated
+
+
+def _lookup(isbn):
+    try:
+        return CatalogService.get_book(isbn)
+    finally:
+        connection.close()
+
+
+enricher = PageCountEnricher(
+    batch_size=getattr(settings, 'PAGE_COUNT_ENRICH_BATCH_SIZE', 50),
+    max_workers=getattr(settings, 'ALADIN_MAX_CONCURRENCY', 8),
+)
@@ -0,0 +1,200 @@
+"""
+다른 서비스(Goodreads, 알라딘 내 서재)에서 내보낸 CSV로 책장 한 번에 가져오기
+
+행마다 add_book을 거치지 않고
+1) CSV를 읽어서 ISBN 정리 -> 2) 카탈로그를 쿼리 한 번으로 조회 -> 3) bulk_create
+4) 해바라기/대시보드 캐시는 가져오기 한 번에 한 번만 갱신
+"""
+from django.db import transaction
+from django.utils import timezone
+import csv
+import io
+from sunflower.services import SunflowerService, DashboardService
+from .enrichment import enricher
+from .models import UserBook
+from .services import CatalogService, is_isbn13
+
+
+MAX_ROWS = 5000
+BATCH_SIZE = 500
+
+# 표준 필드 -> CSV 헤더 후보 (Goodreads / 알라딘 / 직접 만든 파일)
+COLUMN_ALIASES = {
+    'title': ['Title', '제목', '상품명', '도서명', '책 제목'],
+    'author': ['Author', '저자', '지은이', '저자/아티스트'],
+    'isbn13': ['ISBN13', 'ISBN', 'isbn13', 'isbn', 'ISBN13(13자리)'],
+    'pages': ['Number of Pages', '쪽수', '페이지', '페이지수', '페이지 수'],
+    'status': ['Exclusive Shelf', '상태', '읽은 상태', '독서 상태'],
+}
+
+STATUS_ALIASES = {
+    'read': 'completed',
+    '읽음': 'completed',
+    '읽은 책': 'completed',
+    '완독': 'completed',
+    'currently-reading': 'reading',
+    '읽는 중': 'reading',
+    '읽고 있는 책': 'reading',
+    '중단': 'dropped',
+    'did-not-finish': 'dropped',
+}
+
+
+class ShelfImportError(Exception):
+    pass
+
+
+def decode_csv(content):
+    """UTF-8(BOM 포함)로 읽고, 안 되면 엑셀에서 저장한 CP949로 읽음"""
+    for encoding in ('utf-8-sig', 'cp949'):
+        try:
+            return content.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ShelfImportError('파일 인코딩을 알 수 없습니다. UTF-8 CSV로 저장해주세요.')
+
+
+def isbn10_to_13(isbn10):
+    body = '978' + isbn10[:9]
+    total = sum(int(digit) * (1 if i % 2 == 0 else 3) for i, digit in enumerate(body))
+    return body + str((10 - total % 10) % 10)
+
+
+def normalize_isbn(value):
+    """Goodreads의 ="978..." 형식, 하이픈 등을 정리하고 ISBN-10은 13자리로 변환"""
+    value = (value or '').strip().lstrip('=').strip('"').replace('-', '').replace(' ', '')
+    if is_isbn13(value):
+        return value
+    if len(value) == 10 and value[:9].isdigit() and (value[9].isdigit() or value[9] in 'xX'):
+        return isbn10_to_13(value)
+    return ''
+
+
+def _get(line, columns, field):
+    column = columns.get(field)
+    return (line.get(column) or '').strip() if column else ''
+
+
+def _find_columns(header):
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in header:
+                columns[field] = alias
+                break
+    return columns
+
+
+def parse_shelf_csv(content):
+    """
+    CSV 내용(bytes)을 [{'isbn13', 'title', 'author', 'pages', 'status'}] 목록으로 변환
+    (행 목록, ISBN이 없거나 잘못된 행 수) 반환
+    """
+    try:
+        return _parse_rows(csv.DictReader(io.StringIO(decode_csv(content))))
+    except csv.Error as e:
+        raise ShelfImportError(f'CSV 파일을 읽을 수 없습니다: {e}')
+
+
+def _parse_rows(reader):
+    columns = _find_columns(reader.fieldnames or [])
+    if 'isbn13' not in columns or 'title' not in columns:
+        raise ShelfImportError('ISBN과 제목 컬럼이 있는 CSV 파일이어야 합니다.')
+
+    rows = []
+    invalid = 0
+    for line in reader:
+        if len(rows) >= MAX_ROWS:
+            raise ShelfImportError(f'한 번에 최대 {MAX_ROWS}권까지 가져올 수 있습니다.')
+
+        isbn = normalize_isbn(_get(line, columns, 'isbn13'))
+        # Goodreads는 ISBN13이 비어 있고 ISBN(10자리)만 있는 경우가 많음
+        if not isbn and 'ISBN' in line:
+            isbn = normalize_isbn(line.get('ISBN'))
+        title = _get(line, columns, 'title')
+        if not isbn or not title:
+            invalid += 1
+            continue
+
+        try:
+            pages = int(_get(line, columns, 'pages') or 0)
+        except ValueError:
+            pages = 0
+
+        rows.append({
+            'isbn13': isbn,
+            'title': title[:255],
+            'author': _get(line, columns, 'author')[:255],
+            'pages': max(0, pages),
+            'status': STATUS_ALIASES.get(_get(line, columns, 'status').casefold(), 'reading'),
+        })
+    return rows, invalid
+
+
+def import_shelf(user, rows):
+    """
+    파싱한 행으로 UserBook을 bulk_create하고 결과 집계를 반환
+    bulk_create는 post_save 시그널을 보내지 않으므로 해바라기/대시보드 캐시는 마지막에 한 번만 갱신
+    포인트/연속 독서는 새로 추가한 책에는 지급하지 않는 기존 시그널 규칙과 같게 갱신하지 않음
+    (앱 안에서 완독 상태로 바꿀 때만 지급)
+    """
+    existing = set(UserBook.objects.filter(user=user).values_list('external_book_id', flat=True))
+    catalog = CatalogService.get_cached_books([row['isbn13'] for row in rows])
+
+    books = []
+    duplicates = 0
+    for row in rows:
+        isbn = row['isbn13']
+        if isbn in existing:
+            duplicates += 1
+            continue
+        existing.add(isbn)
+
+        catalog_book = catalog.get(isbn)
+        title = catalog_book.title if catalog_book else row['title']
+        author = catalog_book.authors if catalog_book else row['author']
+        total_pages = catalog_book.page_count if catalog_book and catalog_book.page_count > 0 else row['pages']
+        page_count_pending = total_pages <= 0
+        current_page = total_pages if row['status'] == 'completed' else 0
+        books.append(UserBook(
+            user=user,
+            external_book_id=isbn,
+            book_title=title,
+            book_author=author,
+            total_pages=max(0, total_pages),
+            page_count_pending=page_count_pending,
+            status=row['status'],
+            current_page=current_page,
+        ))
+
+    started_at = timezone.now()
+    with transaction.atomic():
+        # 가져오는 동안 같은 책이 add_book으로 추가되면 유니크 제약에 걸리므로 그 행은 건너뛰고,
+        # 실제로 들어간 행을 다시 읽어서 집계
+        UserBook.objects.bulk_create(books, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        created = list(
+            UserBook.objects.filter(
+                user=user,
+                external_book_id__in=[book.external_book_id for book in books],
+                created_at__gte=started_at,
+            ).values('external_book_id', 'current_page', 'page_count_pending')
+        )
+        pages_read = sum(row['current_page'] for row in created)
+        pending_isbns = [row['external_book_id'] for row in created if row['page_count_pending']]
+        if created:
+            SunflowerService.apply_page_delta(user, pages_read)
+            transaction.on_commit(lambda: DashboardService.invalidate(user.id))
+        # 페이지 수를 모르는 책은 백그라운드에서 채움
+        transaction.on_commit(lambda: _enqueue_all(pending_isbns))
+
+    return {
+        'created': len(created),
+        'duplicates': duplicates,
+        'pending': len(pending_isbns),
+        'pages_read': pages_read,
+    }
+
+
+def _enqueue_all(isbns):
+    for isbn in isbns:
+        enricher.enqueue(isbn)
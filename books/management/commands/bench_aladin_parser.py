@@ -0,0 +1,76 @@
+import timeit
+import xml.etree.ElementTree as ET
+from django.core.management.base import BaseCommand
+from books.parsers import ALADIN_NS, parse_search_response
+
+
+ITEM_TEMPLATE = """
+  <item itemId="{n}">
+    <title>테스트 도서 {n} - 부제목이 있는 긴 제목</title>
+    <link>http://www.aladin.co.kr/shop/wproduct.aspx?ItemId={n}</link>
+    <author>홍길동 (지은이), 김철수 (옮긴이)</author>
+    <pubDate>2024-01-{day:02d}</pubDate>
+    <description>도서 {n}에 대한 설명입니다. 알라딘 검색 결과의 description 필드를 흉내 낸 문장입니다.</description>
+    <isbn>89{n:08d}</isbn>
+    <isbn13>97889{n:08d}</isbn13>
+    <priceSales>13500</priceSales>
+    <priceStandard>15000</priceStandard>
+    <mallType>BOOK</mallType>
+    <stockStatus></stockStatus>
+    <mileage>750</mileage>
+    <cover>https://image.aladin.co.kr/product/{n}/cover.jpg</cover>
+    <categoryId>50993</categoryId>
+    <categoryName>국내도서&gt;소설/시/희곡&gt;한국소설</categoryName>
+    <publisher>테스트출판사</publisher>
+    <salesPoint>12345</salesPoint>
+    <customerReviewRank>9</customerReviewRank>
+  </item>"""
+
+
+def build_payload(count):
+    """알라딘 ItemSearch 응답과 같은 구조의 XML 생성"""
+    items = ''.join(ITEM_TEMPLATE.format(n=n, day=n % 28 + 1) for n in range(count))
+    return (
+        f'<?xml version="1.0" encoding="utf-8"?>'
+        f'<object xmlns="{ALADIN_NS}"><version>20131101</version>'
+        f'<totalResults>{count}</totalResults><startIndex>1</startIndex>'
+        f'<itemsPerPage>{count}</itemsPerPage>{items}</object>'
+    ).encode('utf-8')
+
+
+def legacy_parse(content):
+    """이전 방식: 트리 전체를 만든 뒤 item마다 find를 반복"""
+    namespace = {'ns': ALADIN_NS}
+    root = ET.fromstring(content)
+    books = []
+    for item in root.findall('.//ns:item', namespace):
+        fields = {}
+        for tag in ('title', 'author', 'publisher', 'pubDate', 'isbn13', 'isbn',
+                    'description', 'cover', 'priceStandard', 'categoryName'):
+            elem = item.find(f'ns:{tag}', namespace)
+            fields[tag] = elem.text if elem is not None else None
+        books.append(fields)
+    return books
+
+
+class Command(BaseCommand):
+    help = '알라딘 XML 파서 성능 비교 (item 10/50/100개)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200, help='크기별 반복 횟수')
+        parser.add_argument('--file', action='append', default=[], help='녹화해 둔 알라딘 응답 XML 파일')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        payloads = [(f'{count} items', build_payload(count)) for count in (10, 50, 100)]
+        for path in options['file']:
+            with open(path, 'rb') as f:
+                payloads.append((path, f.read()))
+
+        for label, content in payloads:
+            legacy = timeit.timeit(lambda: legacy_parse(content), number=repeat) / repeat
+            current = timeit.timeit(lambda: parse_search_response(content), number=repeat) / repeat
+            self.stdout.write(
+                f'{label}: legacy {legacy * 1000:.3f}ms, iterparse {current * 1000:.3f}ms '
+                f'({legacy / current:.2f}x)'
+            )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from books.enrichment import enrich_isbns
+from books.models import UserBook
+
+
+class Command(BaseCommand):
+    help = '페이지 수 조회가 끝나지 않은 책들의 페이지 수를 일괄로 채움'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='한 번에 조회할 ISBN 수')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        isbns = list(
+            UserBook.objects.filter(page_count_pending=True)
+            .values_list('external_book_id', flat=True)
+            .distinct()
+        )
+        self.stdout.write(f'페이지 수 조회 대기 중인 ISBN: {len(isbns)}개')
+
+        updated = 0
+        for start in range(0, len(isbns), batch_size):
+            updated += enrich_isbns(isbns[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'페이지 수 갱신 완료: {updated}권'))
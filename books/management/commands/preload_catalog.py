@@ -0,0 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from books.aladin import get_book_details, get_client
+from books.models import Book
+from books.services import CatalogService, is_isbn13
+
+
+class RateLimiter:
+    """초당 요청 수 제한 (여러 스레드에서 공유)"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self.lock = threading.Lock()
+        self.next_at = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait_for = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+class Command(BaseCommand):
+    help = 'ISBN 목록(CSV 또는 표준입력)으로 도서 카탈로그를 대량 적재'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help="ISBN CSV 파일 경로 ('-'이면 표준입력)")
+        parser.add_argument('--column', default=None, help='ISBN이 들어 있는 CSV 컬럼 이름 (기본: 첫 번째 컬럼)')
+        parser.add_argument('--workers', type=int, default=8, help='동시 조회 스레드 수')
+        parser.add_argument('--rate', type=float, default=10.0, help='초당 최대 API 호출 수')
+        parser.add_argument('--chunk-size', type=int, default=500, help='한 번에 저장할 도서 수')
+        parser.add_argument('--checkpoint', default=None, help='진행 상황을 저장할 파일 (중단 후 이어서 실행)')
+        parser.add_argument('--refresh', action='store_true', help='이미 최신 정보가 있는 도서도 다시 조회')
+
+    def handle(self, *args, **options):
+        isbns = self.read_isbns(options['source'], options['column'])
+        checkpoint = options['checkpoint']
+        start = self.load_checkpoint(checkpoint)
+        if start:
+            self.stdout.write(f'체크포인트에서 이어서 실행: {start}/{len(isbns)}')
+
+        limiter = RateLimiter(options['rate'])
+        chunk_size = options['chunk_size']
+        started = time.monotonic()
+        stored = skipped = failed = 0
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for offset in range(start, len(isbns), chunk_size):
+                chunk = isbns[offset:offset + chunk_size]
+                if not options['refresh']:
+                    fresh = self.get_fresh_isbns(chunk)
+                    skipped += len(fresh)
+                    chunk = [isbn for isbn in chunk if isbn not in fresh]
+
+                results = list(executor.map(lambda isbn: self.fetch(isbn, limiter), chunk))
+                details_list = [details for details in results if details]
+                stored += CatalogService.store_details(details_list)
+
+                # 알라딘 장애로 차단된 경우 체크포인트를 넘기지 않고 중단 (다시 실행하면 이 청크부터)
+                if get_client().breaker.stats()['state'] != 'closed':
+                    raise CommandError(f'알라딘 API 장애로 중단했습니다. 다시 실행하면 {offset}번째부터 이어집니다.')
+
+                failed += len(results) - len(details_list)
+
+                done = min(offset + chunk_size, len(isbns))
+                self.save_checkpoint(checkpoint, done)
+
+                elapsed = time.monotonic() - started
+                processed = done - start
+                self.stdout.write(
+                    f'{done}/{len(isbns)} 처리 (저장 {stored}, 건너뜀 {skipped}, 실패 {failed}) '
+                    f'- {processed / elapsed if elapsed else 0:.1f}권/초'
+                )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'카탈로그 적재 완료: 저장 {stored}권, 건너뜀 {skipped}권, 실패 {failed}권 ({elapsed:.1f}초)'
+        ))
+
+    def fetch(self, isbn, limiter):
+        limiter.wait()
+        try:
+            return get_book_details(isbn)
+        finally:
+            connection.close()
+
+    def read_isbns(self, source, column):
+        if source == '-':
+            return self.parse_isbns(sys.stdin, column)
+        if not os.path.exists(source):
+            raise CommandError(f'파일을 찾을 수 없습니다: {source}')
+        with open(source, newline='', encoding='utf-8-sig') as f:
+            return self.parse_isbns(f, column)
+
+    def parse_isbns(self, lines, column):
+        reader = csv.reader(lines)
+        index = 0
+        if column:
+            header = next(reader, [])
+            if column not in header:
+                raise CommandError(f'CSV에 {column} 컬럼이 없습니다.')
+            index = header.index(column)
+
+        isbns = []
+        seen = set()
+        for row in reader:
+            if len(row) <= index:
+                continue
+            isbn = row[index].strip().replace('-', '')
+            # 헤더나 잘못된 값은 건너뜀
+            if is_isbn13(isbn) and isbn not in seen:
+                seen.add(isbn)
+                isbns.append(isbn)
+        return isbns
+
+    def get_fresh_isbns(self, isbns):
+        cutoff = timezone.now() - CatalogService.get_ttl()
+        return set(
+            Book.objects.filter(isbn13__in=isbns, fetched_at__gte=cutoff)
+            .values_list('isbn13', flat=True)
+        )
+
+    def load_checkpoint(self, path):
+        if not path or not os.path.exists(path):
+            return 0
+        with open(path) as f:
+            return json.load(f).get('done', 0)
+
+    def save_checkpoint(self, path, done):
+        if not path:
+            return
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'done': done}, f)
+        os.replace(tmp_path, path)
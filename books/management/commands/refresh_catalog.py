@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from books.services import CatalogService
+
+
+class Command(BaseCommand):
+    help = '오래된 도서 카탈로그 정보를 알라딘 API로 갱신 (매일 밤 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='한 번에 갱신할 최대 도서 수')
+
+    def handle(self, *args, **options):
+        isbns = CatalogService.get_stale_isbns(limit=options['limit'])
+        self.stdout.write(f'갱신 대상 도서: {len(isbns)}권')
+
+        refreshed = 0
+        failed = 0
+        for isbn in isbns:
+            if CatalogService.refresh(isbn):
+                refreshed += 1
+            else:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'갱신 실패: {isbn}'))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'카탈로그 갱신 완료: 성공 {refreshed}권, 실패 {failed}권')
+        )
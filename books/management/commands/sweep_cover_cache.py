@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from books.covers import sweep
+
+
+class Command(BaseCommand):
+    help = '표지 이미지 캐시가 최대 크기를 넘으면 오래 사용하지 않은 파일부터 삭제'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-mb', type=int, default=None,
+            help='캐시 최대 크기 (MB, 기본: BOOK_COVER_CACHE_MAX_BYTES)',
+        )
+
+    def handle(self, *args, **options):
+        if options['max_mb'] is not None:
+            max_bytes = options['max_mb'] * 1024 * 1024
+        else:
+            max_bytes = getattr(settings, 'BOOK_COVER_CACHE_MAX_BYTES', 500 * 1024 * 1024)
+
+        removed, total = sweep(max_bytes)
+        self.stdout.write(self.style.SUCCESS(
+            f'표지 캐시 정리 완료: {removed}개 삭제, 현재 {total / 1024 / 1024:.1f}MB'
+        ))
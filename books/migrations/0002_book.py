@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Book',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('isbn13', models.CharField(max_length=13, unique=True)),
+                ('title', models.CharField(max_length=255)),
+                ('authors', models.CharField(blank=True, max_length=255)),
+                ('publisher', models.CharField(blank=True, max_length=255)),
+                ('cover', models.URLField(blank=True, max_length=500)),
+                ('page_count', models.PositiveIntegerField(default=0)),
+                ('category', models.CharField(blank=True, max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('published_date', models.CharField(blank=True, max_length=20)),
+                ('price', models.CharField(blank=True, max_length=20)),
+                ('fetched_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fetched_at'], name='books_book_fetched_f4d9c5_idx')],
+            },
+        ),
+    ]
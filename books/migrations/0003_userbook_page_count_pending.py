@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0002_book'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userbook',
+            name='page_count_pending',
+            field=models.BooleanField(default=False),
+        ),
+    ]
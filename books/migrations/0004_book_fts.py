@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    from books.search_index import FTS_TABLE, create_table, to_document
+
+    with schema_editor.connection.cursor() as cursor:
+        create_table(cursor)
+
+        Book = apps.get_model('books', 'Book')
+        rows = [
+            (book.id, to_document(book.title), to_document(book.authors), to_document(book.publisher))
+            for book in Book.objects.all()
+        ]
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, authors, publisher) VALUES (%s, %s, %s, %s)",
+            rows,
+        )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    from books.search_index import FTS_TABLE
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0003_userbook_page_count_pending'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
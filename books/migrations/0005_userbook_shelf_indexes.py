@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0004_book_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userbook',
+            index=models.Index(fields=['user', 'updated_at'], name='books_userb_user_id_dadd0a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userbook',
+            index=models.Index(fields=['user', 'status', 'updated_at'], name='books_userb_user_id_3b57bf_idx'),
+        ),
+    ]
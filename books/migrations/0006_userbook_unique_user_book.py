@@ -0,0 +1,138 @@
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+
+# 중복된 책을 합칠 때 옮길 관계 (app, 모델)
+MOVE_ALL = [
+    ('reading', 'ReadingNote'),
+    ('reading', 'ReadingEvent'),
+    ('reviews', 'BookReview'),
+    ('chat', 'AIChatSession'),
+]
+# 책마다 하나만 있는 관계 (남길 책에 없을 때만 가장 최근 것을 옮김)
+MOVE_ONE = [
+    ('chat', 'BookReview'),
+    ('reading', 'BookReview'),
+]
+# 이 마이그레이션 시점의 해바라기 성장 규칙 (서비스 코드가 바뀌어도 결과가 같도록 복사해 둠)
+CM_PER_PAGE = Decimal('0.01')
+PAGES_PER_LEVEL = 100
+
+
+def merge_duplicate_user_books(apps, schema_editor):
+    """
+    같은 사용자가 같은 책을 여러 번 추가한 경우 가장 먼저 추가한 책 하나로 합침
+    노트/독서 기록/독후감/채팅은 남길 책으로 옮기고, 진행 상황은 가장 많이 읽은 쪽을 따름
+    """
+    UserBook = apps.get_model('books', 'UserBook')
+    Tombstone = apps.get_model('reading', 'Tombstone')
+    merged_user_ids = set()
+
+    groups = (
+        UserBook.objects.values('user_id', 'external_book_id')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+    )
+    for group in groups:
+        books = list(UserBook.objects.filter(
+            user_id=group['user_id'],
+            external_book_id=group['external_book_id'],
+        ).order_by('id'))
+        keeper, duplicates = books[0], books[1:]
+        duplicate_ids = [book.id for book in duplicates]
+
+        now = timezone.now()
+        latest = max(books, key=lambda book: book.updated_at)
+        total_pages = max(book.total_pages for book in books)
+        start_dates = [book.start_date for book in books if book.start_date]
+        end_dates = [book.end_date for book in books if book.end_date]
+        UserBook.objects.filter(id=keeper.id).update(
+            current_page=max(book.current_page for book in books),
+            total_pages=total_pages,
+            page_count_pending=total_pages <= 0 and any(book.page_count_pending for book in books),
+            status='completed' if any(book.status == 'completed' for book in books) else latest.status,
+            start_date=min(start_dates) if start_dates else None,
+            end_date=max(end_dates) if end_dates else None,
+            updated_at=now,
+        )
+        merged_user_ids.add(group['user_id'])
+
+        for app_label, model_name in MOVE_ALL:
+            model = apps.get_model(app_label, model_name)
+            model.objects.filter(user_book_id__in=duplicate_ids).update(**_moved_fields(model, keeper.id, now))
+
+        for app_label, model_name in MOVE_ONE:
+            model = apps.get_model(app_label, model_name)
+            if model.objects.filter(user_book_id=keeper.id).exists():
+                continue
+            moved = model.objects.filter(user_book_id__in=duplicate_ids).order_by('-updated_at').first()
+            if moved is not None:
+                model.objects.filter(id=moved.id).update(**_moved_fields(model, keeper.id, now))
+
+        # 남은 중복 독후감은 책과 같이 지워짐, 클라이언트 캐시에서도 지워지도록 tombstone 기록
+        UserBook.objects.filter(id__in=duplicate_ids).delete()
+        Tombstone.objects.bulk_create([
+            Tombstone(user_id=group['user_id'], kind='book', object_id=book_id)
+            for book_id in duplicate_ids
+        ])
+
+    _recompute_sunflowers(apps, merged_user_ids)
+
+
+def _moved_fields(model, user_book_id, now):
+    """
+    옮긴 행의 updated_at도 갱신해야 변경 피드 클라이언트가 다시 받음
+    (중복 책 tombstone을 받으면 그 책의 노트를 지우므로)
+    """
+    fields = {'user_book_id': user_book_id}
+    if any(field.name == 'updated_at' for field in model._meta.get_fields()):
+        fields['updated_at'] = now
+    return fields
+
+
+def _recompute_sunflowers(apps, user_ids):
+    """합친 사용자의 해바라기를 책장 current_page 합계로 다시 계산 (중복 책 페이지가 빠지도록)"""
+    if not user_ids:
+        return
+
+    UserBook = apps.get_model('books', 'UserBook')
+    SunflowerGrowth = apps.get_model('sunflower', 'SunflowerGrowth')
+    totals = dict(
+        UserBook.objects.filter(user_id__in=user_ids)
+        .values('user_id').annotate(total=Sum('current_page')).values_list('user_id', 'total')
+    )
+    for user_id in user_ids:
+        total = totals.get(user_id) or 0
+        height = Decimal(total) * CM_PER_PAGE
+        level = max(1, total // PAGES_PER_LEVEL + 1)
+        SunflowerGrowth.objects.update_or_create(
+            user_id=user_id,
+            defaults={
+                'total_pages_read': total,
+                'current_height_cm': height,
+                'level': level,
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0005_userbook_shelf_indexes'),
+        ('reading', '0008_tombstone'),
+        ('reviews', '0001_initial'),
+        ('chat', '0002_bookreview'),
+        ('sunflower', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_user_books, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='userbook',
+            constraint=models.UniqueConstraint(fields=('user', 'external_book_id'), name='unique_user_book'),
+        ),
+    ]
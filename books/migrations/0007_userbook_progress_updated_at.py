@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:49
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_progress_updated_at(apps, schema_editor):
+    # 기존 책은 진행 상황만 바뀐 시각을 알 수 없으므로 updated_at으로 채움
+    UserBook = apps.get_model('books', 'UserBook')
+    UserBook.objects.filter(progress_updated_at__isnull=True).update(progress_updated_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0006_userbook_unique_user_book'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userbook',
+            name='progress_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_progress_updated_at, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,72 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.conf import settings
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Round
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+class UserBookQuerySet(models.QuerySet):
+    # 책장 카드(내 책장, 홈, AI 독후감)에서 쓰는 컬럼
+    CARD_FIELDS = (
+        'id', 'user_id', 'book_title', 'book_author', 'status',
+        'current_page', 'total_pages', 'page_count_pending', 'updated_at',
+    )
+
+    def add(self, user, external_book_id, **fields):
+        """
+        책장에 책 추가, (책, 새로 추가됐는지) 반환
+        get_or_create처럼 먼저 조회하지 않고 바로 INSERT하고,
+        이미 있으면 (user, external_book_id) 유니크 제약 위반으로 알고 그때만 한 번 조회
+        """
+        try:
+            with transaction.atomic():
+                return self.create(user=user, external_book_id=external_book_id, **fields), True
+        except IntegrityError:
+            # 유니크 제약 외의 위반(NOT NULL, FK 등)이면 기존 책이 없으므로 원래 오류를 그대로 올림
+            book = self.filter(user=user, external_book_id=external_book_id).first()
+            if book is None:
+                raise
+            return book, False
+
+    def with_progress(self):
+        """진행률(%, 소수 첫째 자리)을 SQL로 계산해서 progress_percent로 붙임"""
+        return self.annotate(progress_percent=Case(
+            When(total_pages__gt=0, then=Round(F('current_page') * 100.0 / F('total_pages'), 1)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ))
+
+    def shelf_cards(self):
+        """카드에 필요한 컬럼만 읽고 진행률을 붙임"""
+        return self.only(*self.CARD_FIELDS).with_progress()
+
+    def shelf_page(self, cursor=None, limit=30):
+        """
+        최근 업데이트 순((-updated_at, id))으로 limit개씩 조회 (키셋 페이지네이션)
+        (책 목록, 다음 페이지 커서) 반환, 마지막 페이지면 커서는 None
+        """
+        books = self.shelf_cards()
+        if cursor is not None:
+            updated_at, book_id = cursor
+            books = books.filter(Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__gt=book_id))
+
+        books = list(books.order_by('-updated_at', 'id')[:limit + 1])
+        if len(books) <= limit:
+            return books, None
+
+        books = books[:limit]
+        last = books[-1]
+        return books, f'{last.updated_at.isoformat()}_{last.id}'
+
+    @staticmethod
+    def parse_cursor(value):
+        """'updated_at_id' 형식의 커서를 (updated_at, id)로 변환, 잘못된 값이면 ValueError"""
+        updated_at, book_id = value.split('_')
+        updated_at = parse_datetime(updated_at)
+        if updated_at is None:
+            raise ValueError(value)
+        return updated_at, int(book_id)
 
 
 class UserBook(models.Model):
@@ -15,14 +82,76 @@ class UserBook(models.Model):
     book_title = models.CharField(max_length=255)
     book_author = models.CharField(max_length=255, null=True, blank=True)
     total_pages = models.PositiveIntegerField()
+    # 페이지 수를 백그라운드에서 조회 중인지 여부
+    page_count_pending = models.BooleanField(default=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='reading')
     current_page = models.PositiveIntegerField(default=0)
+    # 읽은 페이지/상태를 마지막으로 바꾼 시각 (오프라인 동기화 충돌 판단용, 페이지 수 보강 등은 제외)
+    progress_updated_at = models.DateTimeField(null=True, blank=True)
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserBookQuerySet.as_manager()
+
     class Meta:
         indexes = [
             models.Index(fields=['user']),
+            # 내 책장 최근 업데이트 순 키셋 페이지네이션 (전체 / 상태별)
+            models.Index(fields=['user', 'updated_at']),
+            models.Index(fields=['user', 'status', 'updated_at']),
+        ]
+        constraints = [
+            # 같은 책을 두 번 추가하지 않도록 (중복 클릭/동시 요청 대비)
+            models.UniqueConstraint(fields=['user', 'external_book_id'], name='unique_user_book'),
         ]
+
+
+class Book(models.Model):
+    """알라딘 도서 정보 캐시 (ISBN13 기준)"""
+    isbn13 = models.CharField(max_length=13, unique=True)
+    title = models.CharField(max_length=255)
+    authors = models.CharField(max_length=255, blank=True)
+    publisher = models.CharField(max_length=255, blank=True)
+    cover = models.URLField(max_length=500, blank=True)
+    page_count = models.PositiveIntegerField(default=0)
+    category = models.CharField(max_length=255, blank=True)
+    description = models.TextField(blank=True)
+    published_date = models.CharField(max_length=20, blank=True)
+    price = models.CharField(max_length=20, blank=True)
+    # 마지막으로 ItemLookUp API에서 상세 정보를 가져온 시각
+    fetched_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['fetched_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.isbn13})"
+
+    @property
+    def author_list(self):
+        return [a.strip() for a in self.authors.split(',') if a.strip()] or ['저자 미상']
+
+    def is_fresh(self, ttl):
+        return self.fetched_at is not None and self.fetched_at >= timezone.now() - ttl
+
+    def to_dict(self):
+        """검색 결과와 같은 형태의 딕셔너리로 변환"""
+        return {
+            'id': self.isbn13,
+            'title': self.title,
+            'authors': self.author_list,
+            'description': self.description or '상세 정보가 없습니다.',
+            'page_count': self.page_count,
+            'thumbnail': self.cover or None,
+            'published_date': self.published_date,
+            'publisher': self.publisher,
+            'isbn': self.isbn13,
+            'price': self.price,
+            'category': self.category,
+        }
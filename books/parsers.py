@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from io import BytesIO
+import xml.etree.ElementTree as ET
+
+
+ALADIN_NS = 'http://www.aladin.co.kr/ttb/apiguide.aspx'
+
+# 태그 이름 -> BookRecord 필드 (네임스페이스 유무 모두 미리 계산)
+_FIELD_TAGS = {
+    'title': 'title',
+    'author': 'author',
+    'publisher': 'publisher',
+    'pubDate': 'published_date',
+    'isbn13': 'isbn13',
+    'isbn': 'isbn10',
+    'description': 'description',
+    'cover': 'cover',
+    'priceStandard': 'price',
+    'categoryName': 'category',
+}
+FIELD_MAP = {}
+for _tag, _field in _FIELD_TAGS.items():
+    FIELD_MAP[_tag] = _field
+    FIELD_MAP[f'{{{ALADIN_NS}}}{_tag}'] = _field
+
+ITEM_TAGS = {'item', f'{{{ALADIN_NS}}}item'}
+SUB_INFO_TAGS = {'subInfo', f'{{{ALADIN_NS}}}subInfo'}
+ITEM_PAGE_TAGS = {'itemPage', f'{{{ALADIN_NS}}}itemPage'}
+
+
+@dataclass(slots=True)
+class BookRecord:
+    title: str = ''
+    author: str = ''
+    publisher: str = ''
+    published_date: str = ''
+    isbn13: str = ''
+    isbn10: str = ''
+    description: str = ''
+    cover: str = ''
+    price: str = ''
+    category: str = ''
+    page_count: int = 0
+
+    @property
+    def isbn(self):
+        # 13자리 우선, 없으면 10자리
+        return self.isbn13 or self.isbn10
+
+    @property
+    def authors(self):
+        # 여러 저자는 쉼표로 구분됨
+        return [a.strip() for a in self.author.split(',') if a.strip()] or ['저자 미상']
+
+    def to_dict(self):
+        """검색 결과 템플릿에서 쓰는 딕셔너리 형태로 변환"""
+        description = self.description
+        if self.category:
+            description = f"📚 {self.category}" + (f" | {description}" if description else "")
+
+        book_isbn = self.isbn
+        return {
+            'id': book_isbn if book_isbn else f'aladin_{hash(self.title or "no_title")}',
+            'title': self.title or '제목 없음',
+            'authors': self.authors,
+            'description': description or '상세 정보가 없습니다.',
+            'page_count': self.page_count,
+            'thumbnail': self.cover or None,
+            'published_date': self.published_date,
+            'publisher': self.publisher,
+            'isbn': book_isbn,
+            'price': self.price,
+            'category': self.category,
+        }
+
+
+def iter_items(content):
+    """
+    알라딘 XML 응답을 스트리밍으로 파싱해 item마다 BookRecord를 생성
+    item 하나당 자식 요소를 한 번만 순회하고, 처리한 요소는 바로 비워서 메모리를 아낌
+    """
+    depth = 0
+    for event, elem in ET.iterparse(BytesIO(content), events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            continue
+
+        depth -= 1
+        # 최상위 item만 처리 (subInfo > ebookList 안의 item은 건너뜀)
+        if depth == 1 and elem.tag in ITEM_TAGS:
+            yield _build_record(elem)
+            elem.clear()
+
+
+def _build_record(item):
+    record = BookRecord()
+    for child in item:
+        tag = child.tag
+        field = FIELD_MAP.get(tag)
+        if field is not None:
+            if child.text:
+                setattr(record, field, child.text)
+        elif tag in SUB_INFO_TAGS:
+            for sub in child:
+                if sub.tag in ITEM_PAGE_TAGS and sub.text:
+                    try:
+                        record.page_count = int(sub.text.strip())
+                    except ValueError:
+                        record.page_count = 0
+    return record
+
+
+def parse_search_response(content):
+    """ItemSearch 응답의 모든 도서"""
+    return list(iter_items(content))
+
+
+def parse_lookup_response(content):
+    """ItemLookUp 응답의 첫 번째 도서 (없으면 None)"""
+    return next(iter_items(content), None)
@@ -0,0 +1,128 @@
+"""
+카탈로그(Book) 로컬 전문 검색 인덱스 (SQLite FTS5)
+
+한국어는 띄어쓰기 단위 토큰화로는 부분 검색이 안 되므로
+글자 2개씩 묶은 bigram을 미리 만들어 FTS5에 저장하고, 검색어도 같은 방식으로 나눔
+예) "해리포터" -> "해리 리포 포터"
+"""
+import unicodedata
+from django.db import connection
+from .models import Book
+
+
+FTS_TABLE = 'books_book_fts'
+
+# bm25 가중치: 제목 > 저자 > 출판사
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+# 이보다 짧은 검색어는 bigram 인덱스로 찾을 수 없음
+MIN_QUERY_LENGTH = 2
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def bigrams(text, across_words=False):
+    """
+    텍스트를 글자 bigram 목록으로 변환 (한 글자 단어는 그대로)
+    across_words=True이면 띄어쓰기를 무시한 bigram도 만듦
+    (문서 쪽에 사용: "해리 포터"도 "해리포터"로 검색되도록)
+    """
+    text = unicodedata.normalize('NFC', text or '').casefold()
+    words = text.split()
+    if across_words:
+        words = [''.join(words)]
+
+    tokens = []
+    for word in words:
+        word = ''.join(ch for ch in word if ch.isalnum())
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def to_document(text):
+    return ' '.join(bigrams(text, across_words=True))
+
+
+def create_table(cursor):
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5(title, authors, publisher, tokenize='unicode61 remove_diacritics 0')"
+    )
+
+
+def index_books(books):
+    """Book 목록을 인덱스에 추가하거나 갱신"""
+    if not is_available():
+        return
+    rows = [
+        (book.id, to_document(book.title), to_document(book.authors), to_document(book.publisher))
+        for book in books
+        if book.id is not None
+    ]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, authors, publisher) VALUES (%s, %s, %s, %s)",
+            rows,
+        )
+
+
+def rebuild(chunk_size=1000):
+    """카탈로그 전체로 인덱스를 다시 만듦"""
+    if not is_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+
+    count = 0
+    chunk = []
+    for book in Book.objects.only('id', 'title', 'authors', 'publisher').iterator(chunk_size=chunk_size):
+        chunk.append(book)
+        if len(chunk) >= chunk_size:
+            index_books(chunk)
+            count += len(chunk)
+            chunk = []
+    index_books(chunk)
+    return count + len(chunk)
+
+
+def is_short_query(query):
+    """bigram 인덱스로 찾을 수 없는 한 글자 검색어인지 (한 글자는 bigram 토큰과 일치하지 않음)"""
+    return sum(1 for ch in query or '' if ch.isalnum()) < MIN_QUERY_LENGTH
+
+
+def build_match_query(query):
+    """검색어 bigram을 모두 포함하는 FTS5 MATCH 식"""
+    tokens = dict.fromkeys(bigrams(query))
+    return ' AND '.join('"{}"'.format(token.replace('"', '""')) for token in tokens)
+
+
+def search(query, limit=10):
+    """
+    BM25 순으로 정렬한 Book 목록 반환
+    인덱스를 쓸 수 없는 환경이거나 한 글자 검색어면 None
+    """
+    if not is_available() or is_short_query(query):
+        return None
+
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}, %s, %s, %s) LIMIT %s",
+            [match, *BM25_WEIGHTS, limit],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    books = Book.objects.in_bulk(ids)
+    return [books[book_id] for book_id in ids if book_id in books]
@@ -0,0 +1,295 @@
+from datetime import timedelta
+import hashlib
+import threading
+import time
+import unicodedata
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from .aladin import search_books_api, get_book_details
+from . import search_index
+from .models import Book
+from .singleflight import search_flight, lookup_flight
+
+
+def is_isbn13(value):
+    return bool(value) and len(value) == 13 and value.isdigit()
+
+
+class CatalogService:
+    @staticmethod
+    def get_ttl():
+        return timedelta(days=getattr(settings, 'BOOK_CATALOG_TTL_DAYS', 30))
+
+    @staticmethod
+    def get_book(isbn):
+        """
+        카탈로그에서 도서 조회 (read-through)
+        캐시가 신선하면 그대로 반환하고, 없거나 오래된 경우에만 ItemLookUp API 호출
+        """
+        if not is_isbn13(isbn):
+            return None
+
+        book = Book.objects.filter(isbn13=isbn).first()
+        if book and book.is_fresh(CatalogService.get_ttl()):
+            return book
+
+        refreshed = CatalogService.refresh(isbn)
+        # API 호출 실패 시 오래된 캐시라도 반환
+        return refreshed or book
+
+    @staticmethod
+    def get_cached_book(isbn):
+        """API를 호출하지 않고 카탈로그에 저장된 도서만 조회"""
+        if not is_isbn13(isbn):
+            return None
+        return Book.objects.filter(isbn13=isbn).first()
+
+    @staticmethod
+    def get_cached_books(isbns):
+        """여러 ISBN을 쿼리 한 번으로 조회 (API 호출 없음), {isbn: Book} 반환"""
+        isbns = [isbn for isbn in isbns if is_isbn13(isbn)]
+        if not isbns:
+            return {}
+        return Book.objects.in_bulk(isbns, field_name='isbn13')
+
+    @staticmethod
+    def refresh(isbn):
+        """ItemLookUp API로 도서 정보를 다시 가져와 카탈로그에 저장"""
+        # 같은 ISBN에 대한 동시 조회는 한 번의 API 호출로 합침
+        return lookup_flight.do(isbn, CatalogService._refresh, isbn)
+
+    @staticmethod
+    def _refresh(isbn):
+        # 최근에 조회 실패한 ISBN은 잠시 동안 다시 호출하지 않음 (negative cache)
+        miss_key = f'book_catalog:miss:{isbn}'
+        if cache.get(miss_key):
+            return None
+
+        details = get_book_details(isbn)
+        if not details:
+            cache.set(miss_key, 1, getattr(settings, 'BOOK_CATALOG_NEGATIVE_TTL', 300))
+            return None
+
+        book, created = Book.objects.update_or_create(
+            isbn13=isbn,
+            defaults=dict(CatalogService._to_fields(details), fetched_at=timezone.now())
+        )
+        search_index.index_books([book])
+        return book
+
+    @staticmethod
+    def store_search_results(books):
+        """
+        검색 결과를 카탈로그에 저장
+        검색 API는 페이지 수를 제공하지 않으므로 page_count와 fetched_at은 건드리지 않음
+        """
+        rows = [
+            Book(isbn13=book['isbn'], **CatalogService._to_fields(book))
+            for book in books
+            if is_isbn13(book.get('isbn'))
+        ]
+        if not rows:
+            return 0
+
+        update_fields = [
+            'title', 'authors', 'publisher', 'cover', 'category',
+            'description', 'published_date', 'price', 'updated_at',
+        ]
+        Book.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['isbn13'],
+            update_fields=update_fields,
+        )
+        search_index.index_books(rows)
+        return len(rows)
+
+    @staticmethod
+    def store_details(details_list):
+        """
+        ItemLookUp 결과 여러 건을 한 번에 카탈로그에 저장 (대량 적재용)
+        """
+        fetched_at = timezone.now()
+        rows = [
+            Book(isbn13=details['isbn'], fetched_at=fetched_at, **CatalogService._to_fields(details))
+            for details in details_list
+            if details and is_isbn13(details.get('isbn'))
+        ]
+        if not rows:
+            return 0
+
+        update_fields = [
+            'title', 'authors', 'publisher', 'cover', 'page_count', 'category',
+            'description', 'published_date', 'price', 'fetched_at', 'updated_at',
+        ]
+        Book.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['isbn13'],
+            update_fields=update_fields,
+        )
+        search_index.index_books(rows)
+        return len(rows)
+
+    @staticmethod
+    def get_stale_isbns(limit=None):
+        """TTL이 지났거나 상세 정보를 한 번도 가져오지 않은 도서의 ISBN 목록"""
+        cutoff = timezone.now() - CatalogService.get_ttl()
+        stale = Book.objects.filter(
+            Q(fetched_at__isnull=True) | Q(fetched_at__lt=cutoff)
+        ).order_by('fetched_at').values_list('isbn13', flat=True)
+        if limit:
+            stale = stale[:limit]
+        return list(stale)
+
+    @staticmethod
+    def _to_fields(book):
+        return {
+            'title': (book.get('title') or '')[:255],
+            'authors': ', '.join(book.get('authors') or [])[:255],
+            'publisher': (book.get('publisher') or '')[:255],
+            'cover': book.get('thumbnail') or '',
+            'page_count': book.get('page_count') or 0,
+            'category': (book.get('category') or '')[:255],
+            'description': book.get('description') or '',
+            'published_date': (book.get('published_date') or '')[:20],
+            'price': (book.get('price') or '')[:20],
+        }
+
+
+def normalize_query(query):
+    """
+    검색어 정규화: 유니코드 NFC, 대소문자 통일(casefold), 공백 정리
+    예) "HARRY  potter" -> "harry potter"
+    """
+    query = unicodedata.normalize('NFC', query or '')
+    return ' '.join(query.casefold().split())
+
+
+class BookSearchService:
+    HITS_KEY = 'book_search:hits'
+    MISSES_KEY = 'book_search:misses'
+    STALE_HITS_KEY = 'book_search:stale_hits'
+    LOCAL_HITS_KEY = 'book_search:local_hits'
+
+    @staticmethod
+    def search(query, page_no=1):
+        """
+        검색 결과 캐시 조회
+        - 신선한 캐시: 그대로 반환 (네트워크/XML 파싱 없음)
+        - 오래된 캐시: 즉시 반환하고 백그라운드에서 한 번만 갱신
+        - 캐시 없음: 알라딘 API 호출 후 저장
+        """
+        normalized = normalize_query(query)
+        if not normalized:
+            return []
+
+        key = BookSearchService._cache_key(normalized, page_no)
+        entry = cache.get(key)
+
+        if entry is None and page_no == 1:
+            # 로컬 카탈로그에서 충분히 찾으면 알라딘을 호출하지 않음
+            local_books = BookSearchService.search_local(normalized)
+            if local_books is not None:
+                BookSearchService._incr(BookSearchService.LOCAL_HITS_KEY)
+                return local_books
+
+        if entry is not None:
+            BookSearchService._incr(BookSearchService.HITS_KEY)
+            fresh_ttl = getattr(settings, 'BOOK_SEARCH_CACHE_TTL', 600)
+            if time.time() - entry['fetched_at'] > fresh_ttl:
+                BookSearchService._incr(BookSearchService.STALE_HITS_KEY)
+                BookSearchService._refresh_in_background(normalized, page_no)
+            return entry['books']
+
+        BookSearchService._incr(BookSearchService.MISSES_KEY)
+        return BookSearchService._fetch(normalized, page_no)
+
+    @staticmethod
+    def search_local(normalized):
+        """
+        로컬 카탈로그 전문 검색
+        결과가 BOOK_SEARCH_LOCAL_MIN_RESULTS개 미만이면 None (알라딘 검색 필요)
+        """
+        if not getattr(settings, 'BOOK_SEARCH_LOCAL_FIRST', True):
+            return None
+
+        min_results = getattr(settings, 'BOOK_SEARCH_LOCAL_MIN_RESULTS', 5)
+        books = search_index.search(normalized, limit=10)
+        if not books or len(books) < min_results:
+            return None
+        return [book.to_dict() for book in books]
+
+    @staticmethod
+    def stats():
+        hits = cache.get(BookSearchService.HITS_KEY, 0)
+        misses = cache.get(BookSearchService.MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'stale_hits': cache.get(BookSearchService.STALE_HITS_KEY, 0),
+            'local_hits': cache.get(BookSearchService.LOCAL_HITS_KEY, 0),
+            'hit_ratio': round(hits / total, 3) if total else 0.0,
+        }
+
+    @staticmethod
+    def _fetch(normalized, page_no):
+        # 같은 검색어에 대한 동시 요청은 한 번의 API 호출로 합침
+        key = BookSearchService._cache_key(normalized, page_no)
+        return search_flight.do(key, BookSearchService._fetch_upstream, normalized, page_no)
+
+    @staticmethod
+    def _fetch_upstream(normalized, page_no):
+        books = search_books_api(normalized, page_no)
+
+        # API 오류로 받은 샘플 데이터는 캐시하지 않음
+        if not is_fallback_result(books):
+            cache.set(
+                BookSearchService._cache_key(normalized, page_no),
+                {'books': books, 'fetched_at': time.time()},
+                getattr(settings, 'BOOK_SEARCH_CACHE_STALE_TTL', 60 * 60 * 24),
+            )
+            CatalogService.store_search_results(books)
+        return books
+
+    @staticmethod
+    def _refresh_in_background(normalized, page_no):
+        lock_key = f'{BookSearchService._cache_key(normalized, page_no)}:refreshing'
+        # 같은 검색어에 대해서는 한 번만 갱신
+        if not cache.add(lock_key, 1, 60):
+            return
+
+        def refresh():
+            try:
+                BookSearchService._fetch(normalized, page_no)
+            except Exception as e:
+                print(f"Search cache refresh error: {e}")
+            finally:
+                cache.delete(lock_key)
+                connection.close()
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    @staticmethod
+    def _cache_key(normalized, page_no):
+        digest = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+        return f'book_search:{digest}:{page_no}'
+
+    @staticmethod
+    def _incr(key):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 0, None)
+            cache.incr(key)
+
+
+def is_fallback_result(books):
+    return any(
+        str(book.get('id', '')).startswith('fallback_') or book.get('degraded')
+        for book in books
+    )
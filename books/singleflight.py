@@ -0,0 +1,108 @@
+from django.conf import settings
+from django.core.cache import cache
+import threading
+import time
+import uuid
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    같은 key로 동시에 들어온 호출을 하나로 합침
+    먼저 들어온 호출(leader)만 실제로 실행하고, 나머지는 그 결과를 함께 받음
+    cross_process=True이면 캐시 락으로 다른 프로세스의 중복 호출도 막음
+    """
+
+    def __init__(self, namespace, cross_process=False, lock_timeout=15, poll_interval=0.05):
+        self.namespace = namespace
+        self.cross_process = cross_process
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.coalesced_count = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.calls[key] = call
+            else:
+                self.coalesced_count += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            if self.cross_process:
+                call.result = self._do_cross_process(key, fn, *args, **kwargs)
+            else:
+                call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            call.event.set()
+            with self.lock:
+                self.calls.pop(key, None)
+
+    def _do_cross_process(self, key, fn, *args, **kwargs):
+        lock_key = f'singleflight:{self.namespace}:{key}:lock'
+        result_key = f'singleflight:{self.namespace}:{key}:result'
+
+        # 락 값(호출마다 새 토큰)을 결과에도 붙여서, 이전 호출이 남긴 결과를 받지 않게 함
+        token = uuid.uuid4().hex
+        if cache.add(lock_key, token, self.lock_timeout):
+            try:
+                result = fn(*args, **kwargs)
+                # 기다리던 다른 프로세스가 가져갈 수 있도록 잠시 저장
+                cache.set(result_key, {'token': token, 'result': result}, self.lock_timeout)
+                return result
+            finally:
+                cache.delete(lock_key)
+
+        # 다른 프로세스가 호출 중이면 그 호출의 결과가 나올 때까지 대기
+        token = cache.get(lock_key)
+        deadline = time.monotonic() + self.lock_timeout
+        while token is not None and time.monotonic() < deadline:
+            lock_released = cache.get(lock_key) != token
+            entry = cache.get(result_key)
+            if entry is not None and entry['token'] == token:
+                with self.lock:
+                    self.coalesced_count += 1
+                return entry['result']
+            if lock_released:
+                break
+            time.sleep(self.poll_interval)
+
+        # 결과를 받지 못했으면 직접 호출
+        return fn(*args, **kwargs)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'in_flight': len(self.calls),
+                'coalesced_count': self.coalesced_count,
+            }
+
+
+search_flight = SingleFlight(
+    'book_search',
+    cross_process=getattr(settings, 'BOOK_SINGLEFLIGHT_CROSS_PROCESS', False),
+)
+lookup_flight = SingleFlight(
+    'book_lookup',
+    cross_process=getattr(settings, 'BOOK_SINGLEFLIGHT_CROSS_PROCESS', False),
+)
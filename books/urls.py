@@ -6,4 +6,10 @@ app_name = 'books'
 urlpatterns = [
     path('search/', views.search, name='search'),
     path('add/', views.add_book, name='add'),
+    path('import/', views.import_books, name='import'),
+    path('covers/<str:isbn>/<str:size>.<str:fmt>', views.cover, name='cover'),
+
+    # API 엔드포인트
+    path('api/autocomplete/', views.api_autocomplete, name='api_autocomplete'),
+    path('api/stats/', views.api_stats, name='api_stats'),
 ]
\ No newline at end of file
@@ -1,12 +1,21 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, FileResponse, HttpResponseNotModified, Http404
 from django.conf import settings
+from django.db import transaction
+from sunflower.services import DashboardService
 from .models import UserBook
+from PIL import UnidentifiedImageError
 import requests
-import json
-import xml.etree.ElementTree as ET
+from .aladin import get_client
+from .autocomplete import autocomplete_index
+from .covers import COVER_SIZES, COVER_FORMATS, get_variant, is_allowed_url
+from .enrichment import enricher
+from .imports import ShelfImportError, parse_shelf_csv, import_shelf
+from .services import CatalogService, BookSearchService, is_isbn13
+from .singleflight import search_flight, lookup_flight
 
 
 @login_required
@@ -15,7 +24,7 @@ def search(request):
     books = []
 
     if query:
-        books = search_books_api(query)
+        books = BookSearchService.search(query)
 
     return render(request, 'books/search.html', {
         'query': query,
@@ -31,38 +40,40 @@ def add_book(request):
         book_author = request.POST.get('book_author', '')
         total_pages = request.POST.get('total_pages', 0)
 
-        # ItemLookUp API를 사용해서 상세 정보 가져오기 (페이지 수 포함)
+        try:
+            total_pages = int(total_pages) if total_pages else 0
+        except ValueError:
+            total_pages = 0
+
+        # 카탈로그에 페이지 수가 있으면 바로 사용하고,
+        # 없으면 일단 책을 추가한 뒤 백그라운드에서 ItemLookUp으로 채움
+        page_count_pending = False
         if external_book_id:
-            detailed_info = get_book_details(external_book_id)
-            if detailed_info and detailed_info.get('page_count', 0) > 0:
-                total_pages = detailed_info['page_count']
+            catalog_book = CatalogService.get_cached_book(external_book_id)
+            if catalog_book and catalog_book.page_count > 0:
+                total_pages = catalog_book.page_count
             else:
-                # API에서 페이지 수를 가져오지 못한 경우 기본값 사용
-                try:
-                    total_pages = int(total_pages) if total_pages else 0
-                except ValueError:
-                    total_pages = 0
-        else:
-            try:
-                total_pages = int(total_pages) if total_pages else 0
-            except ValueError:
-                total_pages = 0
+                page_count_pending = is_isbn13(external_book_id)
 
         if external_book_id and book_title:
-            book, created = UserBook.objects.get_or_create(
-                user=request.user,
-                external_book_id=external_book_id,
-                defaults={
-                    'book_title': book_title,
-                    'book_author': book_author,
-                    'total_pages': total_pages,
-                    'status': 'reading',
-                    'current_page': 0
-                }
+            # 중복 클릭/동시 요청도 유니크 제약으로 한 권만 추가됨
+            book, created = UserBook.objects.add(
+                request.user,
+                external_book_id,
+                book_title=book_title,
+                book_author=book_author,
+                total_pages=total_pages,
+                page_count_pending=page_count_pending,
+                status='reading',
+                current_page=0,
             )
 
             if created:
-                page_info = f" ({total_pages}페이지)" if total_pages > 0 else ""
+                if page_count_pending:
+                    transaction.on_commit(lambda: enricher.enqueue(external_book_id))
+                    page_info = " (페이지 수 확인 중)"
+                else:
+                    page_info = f" ({total_pages}페이지)" if total_pages > 0 else ""
                 messages.success(request, f'"{book_title}"{page_info} 책이 내 책장에 추가되었습니다!')
             else:
                 messages.info(request, '이미 내 책장에 있는 책입니다.')
@@ -74,209 +85,94 @@ def add_book(request):
     return redirect('books:search')
 
 
-def search_books_api(query, page_no=1):
-    """
-    알라딘 API를 사용한 도서 검색
-    """
-    if not query:
-        return []
-
-    try:
-        # API 키 확인
-        ttb_key = getattr(settings, 'ALADIN_TTB_KEY', None)
-        if not ttb_key:
-            print("⚠️ Aladin TTB key not configured properly")
-            return get_fallback_books(query)
-
-        # API URL 구성
-        api_url = "http://www.aladin.co.kr/ttb/api/ItemSearch.aspx"
-        params = {
-            'ttbkey': ttb_key,
-            'Query': query,
-            'QueryType': 'Keyword',
-            'MaxResults': 10,
-            'start': page_no,
-            'SearchTarget': 'Book',
-            'output': 'xml',
-            'Version': '20131101'
-        }
-
-        # API 호출
-        print(f"🔍 Making request to: {api_url}")
-        print(f"📋 Params: {params}")
-
-        response = requests.get(api_url, params=params, timeout=10)
-        print(f"✅ Status: {response.status_code}")
-        print(f"📄 Response (first 500 chars): {response.content[:500]}")
-
-        response.raise_for_status()
-
-        # XML 파싱
-        root = ET.fromstring(response.content)
-        print(f"🌳 Root tag: {root.tag}")
-
-        # 네임스페이스 정의
-        namespace = {'ns': 'http://www.aladin.co.kr/ttb/apiguide.aspx'}
-
-        # 네임스페이스를 사용해서 item 찾기
-        items = root.findall('.//ns:item', namespace)
-        print(f"📚 Found {len(items)} items with namespace")
-
-        # 네임스페이스 없이도 시도
-        if len(items) == 0:
-            items = root.findall('.//item')
-            print(f"📚 Found {len(items)} items without namespace")
-
-        books = []
-        # 알라딘 API 응답 구조: item들
-        for item in items:
-            try:
-                # 필수 정보 추출 (네임스페이스 사용)
-                title = item.find('ns:title', namespace)
-                author = item.find('ns:author', namespace)
-                publisher = item.find('ns:publisher', namespace)
-                pub_date = item.find('ns:pubDate', namespace)
-                isbn = item.find('ns:isbn13', namespace)
-                isbn10 = item.find('ns:isbn', namespace)
-
-                # 알라딘에서 제공하는 추가 정보
-                description = item.find('ns:description', namespace)
-                cover = item.find('ns:cover', namespace)
-                price = item.find('ns:priceStandard', namespace)
-                category = item.find('ns:categoryName', namespace)
-
-                # 검색 API에서는 페이지 수 정보가 제공되지 않음
-                # 실제 페이지 수는 ItemLookUp API에서 가져옴
-                page_count = 0
-
-                # 저자 정보 처리
-                author_text = author.text if author is not None and author.text else '저자 미상'
-                author_list = []
-                if author_text and author_text != '저자 미상':
-                    # 여러 저자는 쉼표로 구분됨
-                    author_list = [a.strip() for a in author_text.split(',') if a.strip()]
-
-                if not author_list:
-                    author_list = ['저자 미상']
-
-                # 설명 텍스트 구성
-                description_text = description.text if description is not None and description.text else ''
-                if category is not None and category.text:
-                    description_text = f"📚 {category.text}" + (f" | {description_text}" if description_text else "")
-
-                # ISBN 처리 (13자리 우선, 없으면 10자리)
-                book_isbn = ''
-                if isbn is not None and isbn.text:
-                    book_isbn = isbn.text
-                elif isbn10 is not None and isbn10.text:
-                    book_isbn = isbn10.text
-
-                book_data = {
-                    'id': book_isbn if book_isbn else f'aladin_{hash(title.text if title is not None else "no_title")}',
-                    'title': title.text if title is not None else '제목 없음',
-                    'authors': author_list,
-                    'description': description_text if description_text else '상세 정보가 없습니다.',
-                    'page_count': page_count,
-                    'thumbnail': cover.text if cover is not None and cover.text else None,
-                    'published_date': pub_date.text if pub_date is not None else '',
-                    'publisher': publisher.text if publisher is not None else '',
-                    'isbn': book_isbn,
-                    'price': price.text if price is not None and price.text else ''
-                }
-
-                books.append(book_data)
-                print(f"✅ Added book: {book_data['title'][:30]}...")
+# 업로드 파일 최대 크기 (5MB)
+IMPORT_MAX_FILE_SIZE = 5 * 1024 * 1024
 
-            except Exception as e:
-                # 개별 책 파싱 오류는 로그만 남기고 계속 진행
-                print(f"❌ Error parsing book data: {e}")
-                continue
 
-        print(f"🎉 Returning {len(books)} books")
-        return books
-
-    except requests.RequestException as e:
-        print(f"API request error: {e}")
-        return get_fallback_books(query)
-
-    except ET.ParseError as e:
-        print(f"XML parsing error: {e}")
-        return get_fallback_books(query)
-
-    except Exception as e:
-        print(f"Unexpected error: {e}")
-        return get_fallback_books(query)
-
-
-def get_book_details(isbn):
+@login_required
+def import_books(request):
+    """다른 서비스에서 내보낸 CSV로 책장 가져오기"""
+    if request.method == 'POST':
+        upload = request.FILES.get('csv_file')
+        if not upload:
+            messages.error(request, 'CSV 파일을 선택해주세요.')
+            return redirect('books:import')
+        if upload.size > IMPORT_MAX_FILE_SIZE:
+            messages.error(request, '파일이 너무 큽니다. (최대 5MB)')
+            return redirect('books:import')
+
+        try:
+            rows, invalid = parse_shelf_csv(upload.read())
+        except ShelfImportError as e:
+            messages.error(request, str(e))
+            return redirect('books:import')
+
+        result = import_shelf(request.user, rows)
+        summary = f"{result['created']}권을 내 책장에 추가했습니다."
+        if result['duplicates']:
+            summary += f" (이미 있는 책 {result['duplicates']}권 제외)"
+        if invalid:
+            summary += f" ISBN이 없는 {invalid}행은 건너뛰었습니다."
+        messages.success(request, summary)
+        return redirect('reading:my_books')
+
+    return render(request, 'books/import.html')
+
+
+def cover(request, isbn, size, fmt):
     """
-    알라딘 ItemLookUp API를 사용해서 개별 도서의 상세 정보 가져오기
-    페이지 수 정보를 포함
+    표지 이미지 프록시
+    알라딘 표지를 로컬 캐시에서 크기를 줄여 제공하고, 실패하면 원본 URL로 보냄
     """
-    try:
-        ttb_key = getattr(settings, 'ALADIN_TTB_KEY', None)
-        if not ttb_key:
-            return None
-
-        # ItemLookUp API URL 구성
-        api_url = "http://www.aladin.co.kr/ttb/api/ItemLookUp.aspx"
-        params = {
-            'ttbkey': ttb_key,
-            'itemIdType': 'ISBN13',
-            'ItemId': isbn,
-            'output': 'xml',
-            'Version': '20131101',
-            'OptResult': 'ebookList,usedList,reviewList'
-        }
-
-        response = requests.get(api_url, params=params, timeout=10)
-        response.raise_for_status()
-
-        # XML 파싱
-        root = ET.fromstring(response.content)
-        namespace = {'ns': 'http://www.aladin.co.kr/ttb/apiguide.aspx'}
+    if size not in COVER_SIZES or fmt not in COVER_FORMATS:
+        raise Http404
 
-        # item 찾기
-        item = root.find('.//ns:item', namespace)
-        if item is None:
-            return None
+    book = CatalogService.get_cached_book(isbn)
+    if not book or not is_allowed_url(book.cover):
+        raise Http404
 
-        # 페이지 수 정보 추출 (subInfo > itemPage에서)
-        sub_info = item.find('ns:subInfo', namespace)
-        page_count = 0
-
-        if sub_info is not None:
-            # itemPage 요소 찾기
-            item_page = sub_info.find('ns:itemPage', namespace)
-            if item_page is not None and item_page.text:
-                try:
-                    page_count = int(item_page.text.strip())
-                except ValueError:
-                    page_count = 0
-
-        return {
-            'page_count': page_count
-        }
-
-    except Exception as e:
-        print(f"Error getting book details: {e}")
-        return None
+    try:
+        path, content_hash = get_variant(book.cover, size, fmt)
+    except (requests.RequestException, OSError, UnidentifiedImageError) as e:
+        print(f"Cover proxy error: {e}")
+        return redirect(book.cover)
+
+    etag = f'"{content_hash[:16]}-{size}-{fmt}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        try:
+            cover_file = open(path, 'rb')
+        except OSError as e:
+            # 찾은 뒤 여는 사이에 표지 캐시 정리로 파일이 지워진 경우
+            print(f"Cover proxy error: {e}")
+            return redirect(book.cover)
+        response = FileResponse(cover_file, content_type=COVER_FORMATS[fmt][1])
+    response['ETag'] = etag
+    response['Cache-Control'] = f"public, max-age={getattr(settings, 'BOOK_COVER_MAX_AGE', 60 * 60 * 24 * 7)}"
+    return response
+
+
+# API 엔드포인트
+@login_required
+def api_autocomplete(request):
+    """책 제목 자동완성 API (메모리 인덱스만 사용)"""
+    query = request.GET.get('q', '')
+    return JsonResponse({
+        'query': query,
+        'suggestions': autocomplete_index.suggest(query, limit=10),
+    })
 
 
-def get_fallback_books(query):
-    """
-    API 오류 시 사용할 더미 데이터
-    """
-    return [
-        {
-            'id': f'fallback_{query}_1',
-            'title': f'🚨 API 연결 오류 - {query} 관련 샘플 도서',
-            'authors': ['샘플 저자'],
-            'description': f'⚠️ 도서관정보나루 API 연결에 문제가 있습니다. API 키를 확인하거나 네트워크 상태를 점검해주세요.',
-            'page_count': 250,
-            'thumbnail': None,
-            'published_date': '2024',
-            'publisher': 'API 오류',
-            'isbn': ''
-        }
-    ] if query else []
+@staff_member_required
+def api_stats(request):
+    """운영자용 알라딘 연동/캐시 상태 API"""
+    return JsonResponse({
+        'search_cache': BookSearchService.stats(),
+        'circuit_breaker': get_client().breaker.stats(),
+        'singleflight': {
+            'search': search_flight.stats(),
+            'lookup': lookup_flight.stats(),
+        },
+        'dashboard_cache': DashboardService.stats(),
+    })
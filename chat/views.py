@@ -17,30 +17,17 @@ def ai_chat_main(request):
     """
     AI 채팅 메인 페이지 - 독후감을 생성할 책 선택
     """
-    # 독서 노트가 있는 책들만 필터링
-    books_with_notes = UserBook.objects.filter(
+    # 독서 노트가 있는 책들만 필터링 (진행률은 SQL에서 계산)
+    books = UserBook.objects.filter(
         user=request.user
-    ).annotate(
+    ).shelf_cards().annotate(
         note_count=models.Count('readingnote')
     ).filter(
         note_count__gt=0
     ).order_by('-updated_at')
 
-    # 진행 상황 계산
-    books_data = []
-    for book in books_with_notes:
-        progress_percent = 0
-        if book.total_pages > 0:
-            progress_percent = round((book.current_page * 100) / book.total_pages, 1)
-
-        books_data.append({
-            'book': book,
-            'progress_percent': progress_percent,
-            'note_count': book.note_count
-        })
-
     return render(request, 'chat/ai_chat_main.html', {
-        'books_data': books_data
+        'books': books
     })
 
 
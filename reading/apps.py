@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReadingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reading'
+
+    def ready(self):
+        import reading.signals
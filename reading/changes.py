@@ -0,0 +1,132 @@
+"""
+변경 피드 (클라이언트 캐시 증분 동기화)
+
+클라이언트는 마지막으로 받은 cursor를 보내고, 그 이후 바뀐 책/노트/독후감/포인트 내역과
+삭제된 항목(tombstone)만 받음
+
+- cursor는 서버 시각, 각 항목은 updated_at(포인트 내역은 created_at) >= cursor 인 것만 내려줌
+- 트랜잭션이 늦게 커밋돼서 빠지는 행이 없도록 다음 cursor는 조금 앞당겨서 줌
+  (같은 항목을 다시 받아도 클라이언트는 id 기준으로 덮어쓰면 되므로 문제 없음)
+- 한 번에 너무 많으면 has_more=True, 같은 시각의 행은 페이지 경계에서 나누지 않음
+- cursor가 없거나 tombstone 보관 기간보다 오래됐으면 전체를 내려주고 full=True
+  이때 클라이언트는 has_more가 False가 될 때까지 받은 항목에 없는 캐시를 지움
+"""
+from datetime import timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from books.models import UserBook
+from chat.models import BookReview
+from rewards.models import PointHistory, UserPoint
+from .models import ReadingNote, Tombstone
+
+
+PAGE_SIZE = 500
+# 커밋 지연을 감안해서 다음 cursor를 앞당기는 시간
+CURSOR_OVERLAP = timedelta(seconds=5)
+
+FIELDS = {
+    'books': [
+        'id', 'external_book_id', 'book_title', 'book_author', 'status', 'current_page',
+        'total_pages', 'start_date', 'end_date', 'created_at', 'updated_at',
+    ],
+    'notes': ['id', 'user_book_id', 'page_number', 'note_content', 'created_at', 'updated_at'],
+    'reviews': [
+        'id', 'user_book_id', 'rating', 'liked_point', 'disliked_point',
+        'review_content', 'created_at', 'updated_at',
+    ],
+    'point_history': ['id', 'transaction_type', 'points', 'reason', 'created_at'],
+    'deleted': ['id', 'kind', 'object_id', 'deleted_at'],
+}
+
+
+def get_retention():
+    return timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 90))
+
+
+def format_cursor(since):
+    # URL에 그대로 넣을 수 있도록 '+00:00' 대신 'Z'로 표기
+    return since.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def parse_cursor(value):
+    """cursor 문자열을 시각으로 변환, 빈 값이면 None, 잘못된 값이면 ValueError"""
+    if not value:
+        return None
+    since = parse_datetime(value)
+    if since is None:
+        raise ValueError(value)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def _querysets(user):
+    return {
+        'books': (UserBook.objects.filter(user=user), 'updated_at'),
+        'notes': (ReadingNote.objects.filter(user_book__user=user), 'updated_at'),
+        'reviews': (BookReview.objects.filter(user_book__user=user), 'updated_at'),
+        'point_history': (PointHistory.objects.filter(user=user), 'created_at'),
+        'deleted': (Tombstone.objects.filter(user=user), 'deleted_at'),
+    }
+
+
+def _changed_rows(section, queryset, field, since, limit):
+    """
+    field >= since 인 행을 시각 순으로 limit개까지 반환
+    잘렸으면 (행 목록, 마지막 시각), 다 가져왔으면 (행 목록, None)
+    """
+    if since is not None:
+        queryset = queryset.filter(**{f'{field}__gte': since})
+    queryset = queryset.order_by(field, 'id').values(*FIELDS[section])
+
+    rows = list(queryset[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    # 같은 시각의 행이 페이지 경계에서 잘리면 다음 cursor로 건너뛰게 되므로 마저 가져옴
+    rows += list(queryset.filter(**{field: last[field], 'id__gt': last['id']}))
+    return rows, last[field]
+
+
+def get_changes(user, since=None, limit=PAGE_SIZE):
+    """
+    since 이후 바뀐 항목을 모아서 반환
+    {'cursor', 'has_more', 'full', 'books', 'notes', 'reviews', 'point_history', 'deleted', 'points'}
+    """
+    now = timezone.now()
+    full = since is None or since < now - get_retention()
+    if full:
+        since = None
+
+    result = {}
+    truncated_at = []
+    for section, (queryset, field) in _querysets(user).items():
+        if full and section == 'deleted':
+            # 전체를 다시 받는 경우 클라이언트가 캐시를 통째로 바꾸므로 tombstone은 필요 없음
+            result[section] = []
+            continue
+        rows, last = _changed_rows(section, queryset, field, since, limit)
+        result[section] = rows
+        if last is not None:
+            truncated_at.append(last)
+
+    if truncated_at:
+        # 잘린 항목 중 가장 이른 시각까지는 다 받았으므로 그 다음부터 이어서 받음
+        cursor = min(truncated_at) + timedelta(microseconds=1)
+    else:
+        cursor = now - CURSOR_OVERLAP
+
+    user_points = UserPoint.objects.filter(user=user).first()
+    result.update({
+        'cursor': format_cursor(cursor),
+        'has_more': bool(truncated_at),
+        'full': full,
+        'points': {
+            'total_points': user_points.total_points if user_points else 0,
+            'available_points': user_points.available_points if user_points else 0,
+        },
+    })
+    return result
@@ -0,0 +1,180 @@
+"""
+전자책 단말기 하이라이트 가져오기 (Kindle "My Clippings.txt" 형식)
+
+제목 (저자)
+- Your Highlight on page 12 | Location 180-182 | Added on Monday, ...
+
+하이라이트 내용
+==========
+
+제목/저자가 비슷한 내 책장의 책에 매칭해서 ReadingNote로 bulk_create하고,
+노트 포인트는 책마다 한 번에 모아서 지급
+"""
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from django.db import transaction
+import re
+import unicodedata
+from books.models import UserBook
+from rewards.services import PointService
+from sunflower.services import DashboardService
+from .models import ReadingNote
+from . import search_index
+
+
+SEPARATOR = '=========='
+BATCH_SIZE = 500
+# 제목 유사도가 이 값 이상이면 같은 책으로 봄
+MATCH_THRESHOLD = 0.8
+# 포함 관계만으로 같은 책으로 볼 최소 제목 길이
+MIN_SUBSTRING_LENGTH = 4
+
+TITLE_AUTHOR_RE = re.compile(r'^(?P<title>.*?)\s*\((?P<author>[^()]*)\)\s*$')
+# 'page 12', 'p. 12' (영문) / '12페이지' (한국어 킨들)
+PAGE_RE = re.compile(r'(?:page|페이지|p\.)\s*(\d+)|(\d+)\s*페이지', re.IGNORECASE)
+BOOKMARK_RE = re.compile(r'bookmark|북마크', re.IGNORECASE)
+NOTE_RE = re.compile(r'your note|메모', re.IGNORECASE)
+
+
+class ClippingsImportError(Exception):
+    pass
+
+
+def decode_clippings(content):
+    for encoding in ('utf-8-sig', 'cp949'):
+        try:
+            return content.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ClippingsImportError('파일 인코딩을 알 수 없습니다. UTF-8 텍스트 파일로 저장해주세요.')
+
+
+def parse_clippings(text):
+    """
+    My Clippings.txt 내용을 [{'title', 'author', 'page', 'content', 'is_note'}] 목록으로 변환
+    북마크와 내용이 빈 항목은 건너뜀
+    """
+    clippings = []
+    for block in text.replace('\r\n', '\n').split(SEPARATOR):
+        lines = [line.strip() for line in block.strip('\n\ufeff').split('\n')]
+        if len(lines) < 3:
+            continue
+
+        header, meta = lines[0].lstrip('\ufeff'), lines[1]
+        content = '\n'.join(lines[2:]).strip()
+        if not content or BOOKMARK_RE.search(meta):
+            continue
+
+        match = TITLE_AUTHOR_RE.match(header)
+        title, author = (match.group('title'), match.group('author')) if match else (header, '')
+        page = PAGE_RE.search(meta)
+        clippings.append({
+            'title': title.strip(),
+            'author': author.strip(),
+            'page': int(page.group(1) or page.group(2)) if page else 0,
+            'content': content,
+            'is_note': bool(NOTE_RE.search(meta)),
+        })
+    return clippings
+
+
+def normalize_title(title):
+    """부제(: 이후, 괄호 안)와 공백/문장부호를 없앤 비교용 제목"""
+    title = unicodedata.normalize('NFC', title or '').casefold()
+    title = re.split(r'[:：\-–—]\s', title)[0]
+    title = re.sub(r'\(.*?\)|\[.*?\]', '', title)
+    return ''.join(ch for ch in title if ch.isalnum())
+
+
+def similarity(a, b):
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    # 부제가 붙은 제목 등 포함 관계는 같은 책으로 보되, 짧은 제목('It')이 긴 제목에 우연히 포함된 경우는 제외
+    shorter, longer = sorted((a, b), key=len)
+    if shorter in longer and len(shorter) >= MIN_SUBSTRING_LENGTH and len(shorter) * 2 >= len(longer):
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def match_books(user, clippings):
+    """클리핑의 (제목, 저자)별로 가장 비슷한 UserBook을 찾아 {(제목, 저자): UserBook} 반환"""
+    books = [
+        (book, normalize_title(book.book_title), normalize_title(book.book_author or ''))
+        for book in UserBook.objects.filter(user=user).only('id', 'user_id', 'book_title', 'book_author', 'total_pages')
+    ]
+
+    matches = {}
+    for key in {(clipping['title'], clipping['author']) for clipping in clippings}:
+        title, author = normalize_title(key[0]), normalize_title(key[1])
+        best, best_score = None, 0.0
+        for book, book_title, book_author in books:
+            score = similarity(title, book_title)
+            # 저자까지 비슷하면 가산점 (번역서 제목이 조금 다른 경우 대비)
+            if author and book_author:
+                score += 0.1 * similarity(author, book_author)
+            if score > best_score:
+                best, best_score = book, score
+        if best is not None and best_score >= MATCH_THRESHOLD:
+            matches[key] = best
+    return matches
+
+
+def import_clippings(user, clippings):
+    """
+    매칭된 책에 ReadingNote를 bulk_create
+    post_save 시그널이 없으므로 노트 포인트는 책마다 한 번, 연속 독서/대시보드/검색 인덱스는 마지막에 한 번만 갱신
+    """
+    matches = match_books(user, clippings)
+    matched_ids = [book.id for book in matches.values()]
+
+    # 같은 파일을 다시 올려도 중복으로 들어가지 않도록 기존 노트와 비교
+    existing = set(
+        ReadingNote.objects.filter(user_book_id__in=matched_ids)
+        .values_list('user_book_id', 'page_number', 'note_content')
+    )
+
+    notes = []
+    unmatched = Counter()
+    duplicates = 0
+    for clipping in clippings:
+        book = matches.get((clipping['title'], clipping['author']))
+        if book is None:
+            unmatched[clipping['title']] += 1
+            continue
+
+        content = f"메모: {clipping['content']}" if clipping['is_note'] else clipping['content']
+        page = clipping['page'] or 1
+        if book.total_pages:
+            page = min(page, book.total_pages)
+
+        key = (book.id, page, content)
+        if key in existing:
+            duplicates += 1
+            continue
+        existing.add(key)
+        notes.append(ReadingNote(user_book=book, page_number=page, note_content=content))
+
+    created_by_book = defaultdict(int)
+    with transaction.atomic():
+        for start in range(0, len(notes), BATCH_SIZE):
+            batch = ReadingNote.objects.bulk_create(notes[start:start + BATCH_SIZE])
+            search_index.index_notes(batch)
+            for note in batch:
+                created_by_book[note.user_book] += 1
+
+        points = 0
+        for book, count in created_by_book.items():
+            points += PointService.award_note_points_bulk(user, book, count)
+        if notes:
+            PointService.update_reading_streak(user)
+            transaction.on_commit(lambda: DashboardService.invalidate(user.id))
+
+    return {
+        'created': len(notes),
+        'books': len(created_by_book),
+        'duplicates': duplicates,
+        'unmatched': dict(unmatched),
+        'points': points,
+    }
@@ -0,0 +1,14 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from reading.models import SyncOperation
+
+
+class Command(BaseCommand):
+    help = '보관 기간(SYNC_OPERATION_RETENTION_DAYS)이 지난 오프라인 동기화 작업 키 정리'
+
+    def handle(self, *args, **options):
+        retention = timedelta(days=getattr(settings, 'SYNC_OPERATION_RETENTION_DAYS', 30))
+        count, _ = SyncOperation.objects.filter(created_at__lt=timezone.now() - retention).delete()
+        self.stdout.write(self.style.SUCCESS(f'동기화 작업 키 {count}건 정리 완료'))
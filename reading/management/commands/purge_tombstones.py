@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from reading.changes import get_retention
+from reading.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = '보관 기간(SYNC_TOMBSTONE_RETENTION_DAYS)이 지난 삭제 기록(tombstone) 정리'
+
+    def handle(self, *args, **options):
+        count, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - get_retention()).delete()
+        self.stdout.write(self.style.SUCCESS(f'삭제 기록 {count}건 정리 완료'))
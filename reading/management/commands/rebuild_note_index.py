@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from reading import search_index
+
+
+class Command(BaseCommand):
+    help = '독서 노트 전문 검색 인덱스 재생성'
+
+    def handle(self, *args, **options):
+        if not search_index.is_available():
+            self.stdout.write(self.style.WARNING('SQLite가 아니어서 전문 검색 인덱스를 사용할 수 없습니다.'))
+            return
+
+        count = search_index.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'노트 검색 인덱스 재생성 완료: {count}개'))
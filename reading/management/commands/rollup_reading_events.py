@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from reading.services import ReadingEventService
+
+
+class Command(BaseCommand):
+    help = '독서 기록(ReadingEvent)을 사용자별 일일 독서량(DailyReading)으로 집계'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2, help='다시 집계할 최근 일수 (오늘 포함)')
+        parser.add_argument('--all', action='store_true', help='전체 기록을 처음부터 다시 집계')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            count = ReadingEventService.rollup()
+        else:
+            count = ReadingEventService.rollup_recent(days=options['days'])
+
+        self.stdout.write(self.style.SUCCESS(f'일일 독서량 {count}건 집계 완료'))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0004_book_fts'),
+        ('reading', '0002_bookreview'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyReading',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('pages_read', models.IntegerField(default=0)),
+                ('books_count', models.PositiveIntegerField(default=0)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReadingEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pages', models.IntegerField()),
+                ('current_page', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('user_book', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='books.userbook')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailyreading',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='unique_daily_reading'),
+        ),
+        migrations.AddIndex(
+            model_name='readingevent',
+            index=models.Index(fields=['user', 'created_at'], name='reading_rea_user_id_2fb895_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='readingevent',
+            index=models.Index(fields=['created_at'], name='reading_rea_created_78f1ab_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:22
+
+import django.db.models.deletion
+import reading.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0003_readingevent_dailyreading'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadingYear',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('pages', models.JSONField(default=reading.models.empty_year)),
+                ('sessions', models.JSONField(default=reading.models.empty_year)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='readingyear',
+            constraint=models.UniqueConstraint(fields=('user', 'year'), name='unique_reading_year'),
+        ),
+    ]
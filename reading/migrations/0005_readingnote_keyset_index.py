@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0004_readingyear'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='readingnote',
+            index=models.Index(fields=['user_book', 'page_number', 'id'], name='reading_rea_user_bo_07b0ab_idx'),
+        ),
+    ]
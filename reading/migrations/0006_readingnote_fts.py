@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    from books.search_index import to_document
+    from reading.search_index import FTS_TABLE, create_table, owner_token
+
+    with schema_editor.connection.cursor() as cursor:
+        create_table(cursor)
+
+        ReadingNote = apps.get_model('reading', 'ReadingNote')
+        rows = [
+            (note_id, to_document(content), owner_token(user_id))
+            for note_id, content, user_id in ReadingNote.objects.values_list('id', 'note_content', 'user_book__user_id')
+        ]
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, content, owner) VALUES (%s, %s, %s)",
+            rows,
+        )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    from reading.search_index import FTS_TABLE
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0005_readingnote_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0008_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='syncoperation',
+            index=models.Index(fields=['created_at'], name='reading_syn_created_c92a66_idx'),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from books.models import UserBook
 
@@ -13,6 +14,99 @@ class ReadingNote(models.Model):
         indexes = [
             models.Index(fields=['user_book']),
             models.Index(fields=['page_number']),
+            # 상세 화면 노트 목록 키셋 페이지네이션용
+            models.Index(fields=['user_book', 'page_number', 'id']),
         ]
 
 
+class ReadingEvent(models.Model):
+    """
+    독서 진행 기록 (추가만 하고 수정/삭제하지 않음)
+    통계 화면은 이 테이블 대신 DailyReading 집계를 읽음
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # 책을 삭제해도 기록은 남김
+    user_book = models.ForeignKey(UserBook, on_delete=models.SET_NULL, null=True, blank=True)
+    pages = models.IntegerField()  # 페이지 변화량 (되돌린 경우 음수)
+    current_page = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['created_at']),
+        ]
+
+
+class DailyReading(models.Model):
+    """사용자별 하루 독서량 집계 (rollup_reading_events로 생성)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    date = models.DateField()
+    pages_read = models.IntegerField(default=0)
+    books_count = models.PositiveIntegerField(default=0)
+    event_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='unique_daily_reading'),
+        ]
+
+
+def empty_year():
+    return [0] * 366
+
+
+class ReadingYear(models.Model):
+    """
+    사용자별 연간 독서량 (히트맵/통계용)
+    하루 한 칸씩 366칸 배열로 저장해서 통계 화면은 행 하나만 읽음
+    인덱스 = 1월 1일부터 센 날짜 - 1
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    year = models.PositiveSmallIntegerField()
+    pages = models.JSONField(default=empty_year)  # 날짜별 읽은 페이지 수
+    sessions = models.JSONField(default=empty_year)  # 날짜별 독서 기록 횟수
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'year'], name='unique_reading_year'),
+        ]
+
+
+class SyncOperation(models.Model):
+    """오프라인 동기화 API에서 처리한 작업 키 (같은 요청을 다시 보내도 한 번만 반영)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    key = models.CharField(max_length=64)
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_sync_operation'),
+        ]
+        indexes = [
+            # 보관 기간이 지난 키 정리용
+            models.Index(fields=['created_at']),
+        ]
+
+
+class Tombstone(models.Model):
+    """삭제된 책/노트/독후감 기록 (변경 피드 API로 클라이언트 캐시에서도 지우도록 알려줌)"""
+    KIND_CHOICES = [
+        ('book', '책'),
+        ('note', '독서 노트'),
+        ('review', '독후감'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+            models.Index(fields=['deleted_at']),
+        ]
@@ -0,0 +1,147 @@
+"""
+독서 노트 전문 검색 인덱스 (SQLite FTS5)
+
+카탈로그 검색(books.search_index)과 같은 글자 bigram 방식으로 색인하고,
+owner 컬럼에 사용자 토큰(u<id>)을 넣어서 MATCH 단계에서 내 노트만 걸러냄
+"""
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from books.search_index import bigrams, build_match_query, is_available, is_short_query, to_document
+from .models import ReadingNote
+
+
+FTS_TABLE = 'reading_note_fts'
+
+# bm25 가중치: 본문만 점수에 반영
+BM25_WEIGHTS = (1.0, 0.0)
+
+SNIPPET_BEFORE = 30
+SNIPPET_LENGTH = 120
+
+
+def create_table(cursor):
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5(content, owner, tokenize='unicode61 remove_diacritics 0')"
+    )
+
+
+def owner_token(user_id):
+    return f'u{user_id}'
+
+
+def index_notes(notes):
+    """노트 목록을 인덱스에 추가하거나 갱신 (note.user_book이 필요)"""
+    if not is_available():
+        return
+    rows = [
+        (note.id, to_document(note.note_content), owner_token(note.user_book.user_id))
+        for note in notes
+        if note.id is not None
+    ]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, content, owner) VALUES (%s, %s, %s)",
+            rows,
+        )
+
+
+def remove_note(note_id):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [note_id])
+
+
+def rebuild(chunk_size=1000):
+    """전체 노트로 인덱스를 다시 만듦"""
+    if not is_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+
+    count = 0
+    chunk = []
+    notes = ReadingNote.objects.select_related('user_book').only('id', 'note_content', 'user_book__user_id')
+    for note in notes.iterator(chunk_size=chunk_size):
+        chunk.append(note)
+        if len(chunk) >= chunk_size:
+            index_notes(chunk)
+            count += len(chunk)
+            chunk = []
+    index_notes(chunk)
+    return count + len(chunk)
+
+
+def search(user, query, limit=20):
+    """
+    내 노트 중 검색어 bigram을 모두 포함하는 노트를 BM25 순으로 반환
+    인덱스를 쓸 수 없는 환경이거나 한 글자 검색어면 None (호출하는 쪽에서 icontains로 검색)
+    """
+    if not is_available() or is_short_query(query):
+        return None
+
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}, %s, %s) LIMIT %s",
+            [f'owner : "{owner_token(user.id)}" AND content : ({match})', *BM25_WEIGHTS, limit],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    notes = ReadingNote.objects.select_related('user_book').in_bulk(ids)
+    return [notes[note_id] for note_id in ids if note_id in notes]
+
+
+def _match_spans(text, query):
+    """
+    본문에서 강조할 구간 목록 [(시작, 끝)]
+    검색어 단어가 그대로 있으면 단어를, 없으면 bigram을 찾음 (띄어쓰기가 다른 경우)
+    """
+    lowered = text.casefold()
+    spans = []
+    for terms in (query.casefold().split(), bigrams(query)):
+        for term in terms:
+            start = lowered.find(term)
+            while start != -1:
+                spans.append((start, start + len(term)))
+                start = lowered.find(term, start + len(term))
+        if spans:
+            break
+
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def snippet(text, query):
+    """검색어 주변 본문을 잘라서 <mark>로 강조한 HTML"""
+    spans = _match_spans(text, query)
+    begin = max(0, spans[0][0] - SNIPPET_BEFORE) if spans else 0
+    end = min(len(text), begin + SNIPPET_LENGTH)
+
+    parts = ['…' if begin > 0 else '']
+    position = begin
+    for start, stop in spans:
+        if stop <= begin or start >= end:
+            continue
+        start, stop = max(start, begin), min(stop, end)
+        parts.append(escape(text[position:start]))
+        parts.append(f'<mark>{escape(text[start:stop])}</mark>')
+        position = stop
+    parts.append(escape(text[position:end]))
+    if end < len(text):
+        parts.append('…')
+    return mark_safe(''.join(parts))
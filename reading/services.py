@@ -0,0 +1,201 @@
+from calendar import isleap
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import ReadingNote, ReadingEvent, DailyReading, ReadingYear, empty_year
+
+
+class ReadingNoteService:
+    PAGE_SIZE = 20
+
+    @staticmethod
+    def get_page(user_book, cursor=None, limit=PAGE_SIZE):
+        """
+        (page_number, id) 순서로 노트를 limit개씩 조회 (키셋 페이지네이션)
+        (노트 목록, 다음 페이지 커서) 반환, 마지막 페이지면 커서는 None
+        """
+        notes = ReadingNote.objects.filter(user_book=user_book)
+        if cursor is not None:
+            page_number, note_id = cursor
+            notes = notes.filter(
+                Q(page_number__gt=page_number) | Q(page_number=page_number, id__gt=note_id)
+            )
+
+        notes = list(notes.order_by('page_number', 'id')[:limit + 1])
+        if len(notes) <= limit:
+            return notes, None
+
+        notes = notes[:limit]
+        last = notes[-1]
+        return notes, f'{last.page_number}-{last.id}'
+
+    @staticmethod
+    def parse_cursor(value):
+        """'페이지-id' 형식의 커서를 (page_number, id)로 변환, 잘못된 값이면 ValueError"""
+        page_number, note_id = value.split('-')
+        return int(page_number), int(note_id)
+
+
+class ReadingEventService:
+    @staticmethod
+    def record(user, user_book, pages):
+        """페이지 변화를 독서 기록에 추가 (변화가 없으면 기록하지 않음)"""
+        if not pages:
+            return None
+        event = ReadingEvent.objects.create(
+            user=user,
+            user_book=user_book,
+            pages=pages,
+            current_page=user_book.current_page,
+        )
+        ReadingStatsService.add_today(user, pages)
+        return event
+
+    @staticmethod
+    def record_many(user, changes):
+        """
+        여러 책의 페이지 변화를 한 번에 기록 [(user_book, pages)]
+        연간 통계도 오늘 칸을 한 번만 갱신
+        """
+        events = [
+            ReadingEvent(user=user, user_book=user_book, pages=pages, current_page=user_book.current_page)
+            for user_book, pages in changes
+            if pages
+        ]
+        if not events:
+            return []
+        ReadingEvent.objects.bulk_create(events)
+        ReadingStatsService.add_today(user, sum(event.pages for event in events), sessions=len(events))
+        return events
+
+    @staticmethod
+    def rollup(since=None, batch_size=1000):
+        """
+        since(날짜) 이후의 독서 기록을 사용자별/일별로 다시 집계해서 DailyReading에 저장
+        같은 날을 여러 번 집계해도 결과가 같으므로 주기적으로 최근 며칠만 다시 돌리면 됨
+        집계한 (사용자, 날짜) 수 반환
+        """
+        events = ReadingEvent.objects.all()
+        if since is not None:
+            start = timezone.make_aware(datetime.combine(since, time.min))
+            events = events.filter(created_at__gte=start)
+
+        rows = (
+            events.annotate(date=TruncDate('created_at'))
+            .values('user', 'date')
+            .annotate(
+                pages_read=Sum('pages'),
+                books_count=Count('user_book', distinct=True),
+                event_count=Count('id'),
+            )
+            .order_by()
+        )
+
+        count = 0
+        chunk = []
+        for row in rows.iterator(chunk_size=batch_size):
+            chunk.append(DailyReading(
+                user_id=row['user'],
+                date=row['date'],
+                pages_read=row['pages_read'],
+                books_count=row['books_count'],
+                event_count=row['event_count'],
+            ))
+            if len(chunk) >= batch_size:
+                count += ReadingEventService._save_rollups(chunk)
+                chunk = []
+        return count + ReadingEventService._save_rollups(chunk)
+
+    @staticmethod
+    def rollup_recent(days=2):
+        """오늘을 포함한 최근 며칠만 다시 집계"""
+        since = timezone.localdate() - timedelta(days=days - 1)
+        return ReadingEventService.rollup(since=since)
+
+    @staticmethod
+    def _save_rollups(rows):
+        if not rows:
+            return 0
+        DailyReading.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['user', 'date'],
+            update_fields=['pages_read', 'books_count', 'event_count', 'updated_at'],
+        )
+        ReadingStatsService.apply_rollups(rows)
+        return len(rows)
+
+
+class ReadingStatsService:
+    """연간 독서량 배열(ReadingYear) 갱신 및 통계 계산"""
+
+    @staticmethod
+    def day_index(day):
+        return day.timetuple().tm_yday - 1
+
+    @staticmethod
+    def add_today(user, pages, sessions=1):
+        """독서 기록이 생길 때 오늘 칸만 증가"""
+        today = timezone.localdate()
+        index = ReadingStatsService.day_index(today)
+        with transaction.atomic():
+            ReadingYear.objects.get_or_create(user=user, year=today.year)
+            reading_year = ReadingYear.objects.select_for_update().get(user=user, year=today.year)
+            reading_year.pages[index] += pages
+            reading_year.sessions[index] += sessions
+            reading_year.save(update_fields=['pages', 'sessions', 'updated_at'])
+
+    @staticmethod
+    def apply_rollups(rows):
+        """
+        DailyReading 집계 결과로 해당 날짜 칸을 덮어씀
+        (실시간으로 더한 값이 어긋나도 집계 때 바로잡힘)
+        """
+        cells = defaultdict(dict)
+        for row in rows:
+            cells[(row.user_id, row.date.year)][ReadingStatsService.day_index(row.date)] = row
+
+        with transaction.atomic():
+            for (user_id, year), days in cells.items():
+                ReadingYear.objects.get_or_create(user_id=user_id, year=year)
+                reading_year = ReadingYear.objects.select_for_update().get(user_id=user_id, year=year)
+                for index, row in days.items():
+                    reading_year.pages[index] = row.pages_read
+                    reading_year.sessions[index] = row.event_count
+                reading_year.save(update_fields=['pages', 'sessions', 'updated_at'])
+
+    @staticmethod
+    def get_stats(user, year):
+        """
+        연간 통계 (ReadingYear 행 하나만 조회)
+        날짜별 페이지 수, 월별 합계, 기록 1회당 평균 페이지 수
+        """
+        row = ReadingYear.objects.filter(user=user, year=year).values('pages', 'sessions').first()
+        if row is None:
+            row = {'pages': empty_year(), 'sessions': empty_year()}
+
+        days_in_year = 366 if isleap(year) else 365
+        # 페이지를 되돌린 날은 0으로 표시
+        pages = [max(0, value) for value in row['pages'][:days_in_year]]
+        sessions = row['sessions'][:days_in_year]
+
+        months = [0] * 12
+        for index, value in enumerate(pages):
+            months[(date(year, 1, 1) + timedelta(days=index)).month - 1] += value
+
+        total_pages = sum(pages)
+        total_sessions = sum(sessions)
+        return {
+            'year': year,
+            'start_weekday': date(year, 1, 1).weekday(),
+            'days': pages,
+            'months': months,
+            'total_pages': total_pages,
+            'sessions': total_sessions,
+            'active_days': sum(1 for value in pages if value > 0),
+            'max_pages': max(pages),
+            'avg_pages_per_session': round(total_pages / total_sessions, 1) if total_sessions else 0.0,
+        }
@@ -0,0 +1,48 @@
+from django.db.models.signals import post_save, post_delete
+from django.db.models import QuerySet
+from django.dispatch import receiver
+from books.models import UserBook
+from chat.models import BookReview
+from .models import ReadingNote, Tombstone
+from . import search_index
+
+
+@receiver(post_save, sender=ReadingNote)
+def index_note(sender, instance, raw=False, **kwargs):
+    """노트 작성/수정 시 검색 인덱스 갱신"""
+    if not raw:
+        search_index.index_notes([instance])
+
+
+@receiver(post_delete, sender=ReadingNote)
+def unindex_note(sender, instance, **kwargs):
+    """노트 삭제 시 검색 인덱스에서 제거"""
+    search_index.remove_note(instance.id)
+
+
+def _deleted_directly(sender, origin):
+    """
+    삭제가 이 모델에서 시작됐는지 여부
+    책이 지워지면서 같이 지워진 노트/독후감은 책 tombstone으로 충분하고,
+    회원 탈퇴로 지워지는 경우는 tombstone을 남길 사용자가 없음
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is sender
+
+
+@receiver(post_delete, sender=UserBook)
+def record_book_tombstone(sender, instance, origin=None, **kwargs):
+    if _deleted_directly(sender, origin):
+        Tombstone.objects.create(user_id=instance.user_id, kind='book', object_id=instance.id)
+
+
+@receiver(post_delete, sender=ReadingNote)
+def record_note_tombstone(sender, instance, origin=None, **kwargs):
+    if _deleted_directly(sender, origin):
+        Tombstone.objects.create(user_id=instance.user_book.user_id, kind='note', object_id=instance.id)
+
+
+@receiver(post_delete, sender=BookReview)
+def record_review_tombstone(sender, instance, origin=None, **kwargs):
+    if _deleted_directly(sender, origin):
+        Tombstone.objects.create(user_id=instance.user_book.user_id, kind='review', object_id=instance.id)
@@ -0,0 +1,223 @@
+"""
+모바일 앱 오프라인 동기화
+
+오프라인에서 쌓인 진행 상황/노트 작업을 한 번에 받아서 트랜잭션 하나로 반영
+- key: 작업마다 클라이언트가 만든 고유 키, 이미 처리한 키는 다시 반영하지 않음 (재전송 안전)
+- client_ts: 작업 시각, 같은 책의 진행 상황은 가장 나중 작업만 반영 (last-writer-wins)
+  서버에서 그 이후에 진행 상황이 바뀐 책(progress_updated_at이 더 늦음)은 덮어쓰지 않음
+- 해바라기/통계/포인트/대시보드는 작업마다가 아니라 배치마다 한 번 갱신
+"""
+from collections import defaultdict
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from books.models import UserBook
+from rewards.services import PointService
+from sunflower.services import SunflowerService, DashboardService
+from .models import ReadingNote, SyncOperation
+from .services import ReadingEventService
+from . import search_index
+
+
+MAX_OPERATIONS = 500
+OPERATION_TYPES = ('progress', 'note')
+STATUSES = [choice[0] for choice in UserBook.STATUS_CHOICES]
+
+
+class SyncError(Exception):
+    pass
+
+
+def _parse_operation(raw):
+    """작업 하나를 검증해서 정리한 dict로 반환, 잘못된 작업이면 SyncError"""
+    if not isinstance(raw, dict):
+        raise SyncError('작업 형식이 올바르지 않습니다.')
+
+    key = str(raw.get('key') or '')
+    if not key or len(key) > 64:
+        raise SyncError('key가 필요합니다. (최대 64자)')
+    if raw.get('type') not in OPERATION_TYPES:
+        raise SyncError('type은 progress 또는 note여야 합니다.')
+
+    client_ts = parse_datetime(str(raw.get('client_ts') or ''))
+    if client_ts is None:
+        raise SyncError('client_ts가 올바른 ISO 8601 시각이 아닙니다.')
+    if timezone.is_naive(client_ts):
+        client_ts = timezone.make_aware(client_ts)
+
+    try:
+        operation = {
+            'key': key,
+            'type': raw['type'],
+            'book_id': int(raw.get('book_id')),
+            'client_ts': client_ts,
+        }
+        if raw['type'] == 'progress':
+            operation['current_page'] = max(0, int(raw.get('current_page')))
+            operation['status'] = raw.get('status') or None
+            if operation['status'] is not None and operation['status'] not in STATUSES:
+                raise SyncError('status 값이 올바르지 않습니다.')
+        else:
+            operation['page_number'] = int(raw.get('page_number'))
+            operation['content'] = str(raw.get('content') or '').strip()
+            if not operation['content']:
+                raise SyncError('노트 내용이 비어 있습니다.')
+    except (TypeError, ValueError):
+        raise SyncError('book_id와 페이지 번호는 숫자여야 합니다.')
+    return operation
+
+
+def apply_operations(user, raw_operations):
+    """
+    작업 목록을 반영하고 (작업별 결과, 바뀐 책 목록) 반환
+    결과 status: applied / duplicate / superseded / stale / not_found / invalid
+    """
+    if not isinstance(raw_operations, list):
+        raise SyncError('operations는 목록이어야 합니다.')
+    if len(raw_operations) > MAX_OPERATIONS:
+        raise SyncError(f'한 번에 최대 {MAX_OPERATIONS}개까지 보낼 수 있습니다.')
+
+    statuses = {}
+    errors = {}
+    operations = []
+    for index, raw in enumerate(raw_operations):
+        try:
+            operation = _parse_operation(raw)
+        except SyncError as e:
+            statuses[index] = 'invalid'
+            errors[index] = str(e)
+            continue
+        operation['index'] = index
+        operations.append(operation)
+
+    with transaction.atomic():
+        # 책 행을 먼저 잠근 뒤 처리한 키를 읽어야, 같은 배치를 동시에 재전송해도
+        # 뒤 요청이 앞 요청의 커밋을 기다렸다가 duplicate로 걸러냄
+        books = UserBook.objects.select_for_update().filter(
+            user=user,
+            id__in={operation['book_id'] for operation in operations},
+        ).in_bulk()
+        keys = [operation['key'] for operation in operations]
+        seen = set(SyncOperation.objects.filter(user=user, key__in=keys).values_list('key', flat=True))
+
+        processed = []
+        latest_progress = {}
+        notes = []
+        for operation in operations:
+            index = operation['index']
+            if operation['key'] in seen:
+                statuses[index] = 'duplicate'
+                continue
+            seen.add(operation['key'])
+            processed.append(operation)
+
+            book = books.get(operation['book_id'])
+            if book is None:
+                statuses[index] = 'not_found'
+            elif operation['type'] == 'note':
+                if operation['page_number'] < 1 or (book.total_pages and operation['page_number'] > book.total_pages):
+                    statuses[index] = 'invalid'
+                    errors[index] = '노트 페이지가 책의 페이지 범위를 벗어났습니다.'
+                    continue
+                notes.append(ReadingNote(
+                    user_book=book,
+                    page_number=operation['page_number'],
+                    note_content=operation['content'],
+                ))
+                statuses[index] = 'applied'
+            else:
+                # 같은 책의 진행 상황은 client_ts가 가장 늦은 작업만 남김
+                previous = latest_progress.get(book.id)
+                if previous is None or operation['client_ts'] >= previous['client_ts']:
+                    if previous is not None:
+                        statuses[previous['index']] = 'superseded'
+                    latest_progress[book.id] = operation
+                    statuses[index] = 'applied'
+                else:
+                    statuses[index] = 'superseded'
+
+        changed_books = _apply_progress(user, books, latest_progress, statuses)
+        note_counts = _apply_notes(user, notes)
+
+        if changed_books or note_counts:
+            PointService.update_reading_streak(user)
+            transaction.on_commit(lambda: DashboardService.invalidate(user.id))
+
+        # 처리한 키를 저장해서 재전송된 작업은 duplicate로 응답
+        SyncOperation.objects.bulk_create(
+            [
+                SyncOperation(user=user, key=operation['key'], status=statuses[operation['index']])
+                for operation in processed
+            ],
+            ignore_conflicts=True,
+        )
+
+    results = []
+    for index, raw in enumerate(raw_operations):
+        result = {
+            'key': raw.get('key') if isinstance(raw, dict) else None,
+            'status': statuses[index],
+        }
+        if index in errors:
+            result['error'] = errors[index]
+        results.append(result)
+
+    touched = {operation['book_id'] for operation in operations if operation['book_id'] in books}
+    return results, [books[book_id] for book_id in sorted(touched)]
+
+
+def _apply_progress(user, books, latest_progress, statuses):
+    """책별 마지막 진행 상황을 bulk_update로 반영하고, 해바라기/통계/완독 포인트는 한 번에 처리"""
+    now = timezone.now()
+    changed = []
+    completed = []
+    pages_read = 0
+    for book_id, operation in latest_progress.items():
+        book = books[book_id]
+        # 서버에서 진행 상황이 더 나중에 바뀐 책은 덮어쓰지 않음
+        # (updated_at은 페이지 수 보강 등으로도 바뀌므로 진행 상황 전용 시각과 비교)
+        if (book.progress_updated_at or book.created_at) > operation['client_ts']:
+            statuses[operation['index']] = 'stale'
+            continue
+
+        new_page = operation['current_page']
+        new_status = operation['status'] or book.status
+        if book.total_pages and new_page >= book.total_pages:
+            new_page = book.total_pages
+            new_status = 'completed'
+
+        if new_status == 'completed' and book.status != 'completed':
+            completed.append(book)
+        delta = new_page - book.current_page
+        pages_read += delta
+
+        book.current_page = new_page
+        book.status = new_status
+        book.updated_at = now
+        book.progress_updated_at = now
+        changed.append((book, delta))
+
+    if not changed:
+        return []
+
+    UserBook.objects.bulk_update([book for book, delta in changed], ['current_page', 'status', 'updated_at', 'progress_updated_at'])
+    SunflowerService.apply_page_delta(user, pages_read)
+    ReadingEventService.record_many(user, changed)
+    for book in completed:
+        PointService.award_book_completion_points(user, book)
+    return [book for book, delta in changed]
+
+
+def _apply_notes(user, notes):
+    """노트를 bulk_create하고 검색 인덱스/노트 포인트는 책마다 한 번에 처리"""
+    if not notes:
+        return {}
+    ReadingNote.objects.bulk_create(notes)
+    search_index.index_notes(notes)
+
+    counts = defaultdict(int)
+    for note in notes:
+        counts[note.user_book] += 1
+    for book, count in counts.items():
+        PointService.award_note_points_bulk(user, book, count, source='동기화')
+    return counts
@@ -1,3 +1,137 @@
-from django.test import TestCase
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from books.models import UserBook
+from rewards.models import PointHistory
+from .changes import format_cursor, get_changes
+from .clippings import normalize_title, parse_clippings, similarity
+from .models import ReadingNote
+from .sync import apply_operations
 
-# Create your tests here.
+
+class ParseClippingsTest(SimpleTestCase):
+    """킨들 My Clippings.txt 파싱"""
+
+    def test_english_page(self):
+        text = (
+            'Sapiens (Harari, Yuval Noah)\n'
+            '- Your Highlight on page 12 | Location 180-182 | Added on Monday\n'
+            '\n'
+            'highlight\n'
+            '==========\n'
+        )
+        clippings = parse_clippings(text)
+        self.assertEqual(clippings[0]['page'], 12)
+        self.assertEqual(clippings[0]['author'], 'Harari, Yuval Noah')
+
+    def test_korean_page(self):
+        text = (
+            '사피엔스 (유발 하라리)\n'
+            '- 12페이지 | 위치 180-182의 하이라이트 | 추가된 날짜: 2024년 3월 4일 월요일\n'
+            '\n'
+            '하이라이트\n'
+            '==========\n'
+        )
+        clippings = parse_clippings(text)
+        self.assertEqual(clippings[0]['page'], 12)
+        self.assertEqual(clippings[0]['content'], '하이라이트')
+
+
+class SimilarityTest(SimpleTestCase):
+    def test_edition_suffix_matches(self):
+        title = normalize_title('해리 포터와 마법사의 돌')
+        self.assertEqual(similarity(title, normalize_title('해리 포터와 마법사의 돌 1')), 1.0)
+
+    def test_short_title_does_not_claim_longer_title(self):
+        self.assertLess(similarity(normalize_title('It'), normalize_title('The Little Prince')), 0.8)
+
+
+class ApplyOperationsTest(TestCase):
+    """오프라인 동기화 작업 반영"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='reader', password='x')
+        self.book = UserBook.objects.create(
+            user=self.user, external_book_id='9788901296906', book_title='사피엔스', total_pages=300,
+        )
+        self.ts = timezone.now() + timedelta(seconds=1)
+
+    def progress(self, key, page, ts):
+        return {'key': key, 'type': 'progress', 'book_id': self.book.id, 'client_ts': ts.isoformat(), 'current_page': page}
+
+    def note(self, key):
+        return {'key': key, 'type': 'note', 'book_id': self.book.id, 'client_ts': self.ts.isoformat(),
+                'page_number': 10, 'content': '메모'}
+
+    def test_latest_progress_wins(self):
+        results, books = apply_operations(self.user, [
+            self.progress('a', 50, self.ts + timedelta(seconds=1)),
+            self.progress('b', 30, self.ts),
+        ])
+        self.assertEqual([r['status'] for r in results], ['applied', 'superseded'])
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.current_page, 50)
+
+    def test_retry_is_duplicate(self):
+        batch = [self.progress('a', 50, self.ts), self.note('n')]
+        apply_operations(self.user, batch)
+        results, books = apply_operations(self.user, batch)
+        self.assertEqual([r['status'] for r in results], ['duplicate', 'duplicate'])
+        self.assertEqual(ReadingNote.objects.filter(user_book=self.book).count(), 1)
+        self.assertEqual(PointHistory.objects.filter(user=self.user, reason__contains='독서노트').count(), 1)
+
+    def test_note_points_use_sync_reason(self):
+        apply_operations(self.user, [self.note('n')])
+        history = PointHistory.objects.get(user=self.user, reason__contains='독서노트')
+        self.assertIn('동기화', history.reason)
+
+    def test_stale_after_server_progress(self):
+        UserBook.objects.filter(id=self.book.id).update(progress_updated_at=self.ts + timedelta(minutes=1))
+        results, books = apply_operations(self.user, [self.progress('a', 50, self.ts)])
+        self.assertEqual(results[0]['status'], 'stale')
+
+    def test_enrichment_does_not_make_progress_stale(self):
+        UserBook.objects.filter(id=self.book.id).update(updated_at=self.ts + timedelta(minutes=1))
+        results, books = apply_operations(self.user, [self.progress('a', 50, self.ts)])
+        self.assertEqual(results[0]['status'], 'applied')
+
+    def test_api_rejects_malformed_json(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('reading:api_sync'), '{', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class ChangesTest(TestCase):
+    """변경 피드"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='reader', password='x')
+        self.book = UserBook.objects.create(
+            user=self.user, external_book_id='9788901296906', book_title='사피엔스', total_pages=300,
+        )
+
+    def test_first_request_is_full(self):
+        changes = get_changes(self.user)
+        self.assertTrue(changes['full'])
+        self.assertEqual([row['id'] for row in changes['books']], [self.book.id])
+
+    def test_incremental_returns_changes_and_deletions(self):
+        since = timezone.now()
+        note = ReadingNote.objects.create(user_book=self.book, page_number=1, note_content='메모')
+        note_id = note.id
+        note.delete()
+        changes = get_changes(self.user, since)
+        self.assertFalse(changes['full'])
+        self.assertEqual(changes['books'], [])
+        self.assertEqual([(row['kind'], row['object_id']) for row in changes['deleted']], [('note', note_id)])
+
+    def test_page_is_truncated(self):
+        since = timezone.now()
+        for page in range(3):
+            ReadingNote.objects.create(user_book=self.book, page_number=page + 1, note_content='메모')
+        changes = get_changes(self.user, since, limit=2)
+        self.assertTrue(changes['has_more'])
+        self.assertGreaterEqual(len(changes['notes']), 2)
+        self.assertLess(changes['cursor'], format_cursor(timezone.now()))
@@ -5,10 +5,19 @@ app_name = 'reading'
 
 urlpatterns = [
     path('', views.my_books, name='my_books'),
+    path('api/books/', views.api_books, name='api_books'),
+    path('stats/', views.stats, name='stats'),
+    path('api/stats/', views.api_stats, name='api_stats'),
+    path('notes/search/', views.note_search, name='note_search'),
+    path('api/notes/search/', views.api_note_search, name='api_note_search'),
+    path('api/sync/', views.api_sync, name='api_sync'),
+    path('api/changes/', views.api_changes, name='api_changes'),
+    path('import/clippings/', views.import_clippings_view, name='import_clippings'),
     path('<int:book_id>/', views.detail, name='detail'),
     path('<int:book_id>/progress/', views.update_progress, name='update_progress'),
     path('<int:book_id>/update-with-note/', views.update_with_note, name='update_with_note'),
     path('<int:book_id>/notes/', views.add_note, name='add_note'),
+    path('<int:book_id>/api/notes/', views.api_notes, name='api_notes'),
     path('<int:book_id>/notes/<int:note_id>/delete/', views.delete_note, name='delete_note'),
     path('<int:book_id>/delete/', views.delete_book, name='delete_book'),
 ]
\ No newline at end of file
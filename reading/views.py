@@ -1,36 +1,79 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse
+from django.views.decorators.http import require_POST
 from django.db import transaction, models
-from decimal import Decimal
+from django.utils import timezone
+import json
 from books.models import UserBook
-from sunflower.models import SunflowerGrowth
+from books.enrichment import enricher
+from sunflower.services import SunflowerService
 from .models import ReadingNote
+from . import search_index
+from .clippings import ClippingsImportError, decode_clippings, parse_clippings, import_clippings
+from .services import ReadingNoteService, ReadingEventService, ReadingStatsService
+from .sync import SyncError, apply_operations
+from .changes import get_changes, parse_cursor
+
+
+def _get_shelf_status(request):
+    """상태 필터 (잘못된 값이면 전체)"""
+    status = request.GET.get('status', '')
+    return status if status in dict(UserBook.STATUS_CHOICES) else ''
+
+
+def _get_shelf_page(request, status, cursor=None):
+    books = UserBook.objects.filter(user=request.user)
+    if status:
+        books = books.filter(status=status)
+    return books.shelf_page(cursor)
 
 
 @login_required
 def my_books(request):
-    books_queryset = UserBook.objects.filter(user=request.user).order_by('-updated_at')
+    # 진행률은 SQL에서 계산하고, 첫 페이지만 그린 뒤 나머지는 스크롤할 때 불러옴
+    status = _get_shelf_status(request)
+    books, next_cursor = _get_shelf_page(request, status)
+
+    return render(request, 'reading/my_books.html', {
+        'books': books,
+        'next_cursor': next_cursor,
+        'status': status,
+        'status_choices': UserBook.STATUS_CHOICES,
+    })
 
-    books = []
-    for book in books_queryset:
-        progress_percent = 0
-        if book.total_pages > 0:
-            progress_percent = round((book.current_page * 100) / book.total_pages, 1)
 
-        books.append({
-            'book': book,
-            'progress_percent': progress_percent
-        })
+@login_required
+def api_books(request):
+    """내 책장 다음 페이지 API (무한 스크롤)"""
+    status = _get_shelf_status(request)
+    try:
+        cursor = UserBook.objects.parse_cursor(request.GET.get('after', ''))
+    except ValueError:
+        return JsonResponse({'error': '잘못된 커서입니다.'}, status=400)
 
-    return render(request, 'reading/my_books.html', {'books': books})
+    books, next_cursor = _get_shelf_page(request, status, cursor)
+    html = render_to_string('reading/book_cards.html', {'books': books}, request=request)
+
+    return JsonResponse({
+        'html': html,
+        'count': len(books),
+        'next_cursor': next_cursor,
+    })
 
 
 @login_required
 def detail(request, book_id):
     book = get_object_or_404(UserBook, id=book_id, user=request.user)
-    notes = ReadingNote.objects.filter(user_book=book).order_by('page_number')
+    # 노트가 많은 책도 빠르게 열리도록 첫 페이지만 그리고 나머지는 스크롤할 때 불러옴
+    notes, next_cursor = ReadingNoteService.get_page(book)
+    note_count = ReadingNote.objects.filter(user_book=book).count()
+
+    # 페이지 수 조회가 아직 끝나지 않았으면 다시 요청 (서버 재시작 등으로 누락된 경우 대비)
+    if book.page_count_pending:
+        enricher.enqueue(book.external_book_id)
 
     progress_percent = 0
     if book.total_pages > 0:
@@ -48,12 +91,34 @@ def detail(request, book_id):
     return render(request, 'reading/detail.html', {
         'book': book,
         'notes': notes,
+        'note_count': note_count,
+        'next_cursor': next_cursor,
         'progress_percent': progress_percent,
         'has_review': has_review,
         'book_review': book_review,
     })
 
 
+@login_required
+def api_notes(request, book_id):
+    """노트 목록 다음 페이지 API (무한 스크롤)"""
+    book = get_object_or_404(UserBook, id=book_id, user=request.user)
+
+    try:
+        cursor = ReadingNoteService.parse_cursor(request.GET.get('after', ''))
+    except ValueError:
+        return JsonResponse({'error': '잘못된 커서입니다.'}, status=400)
+
+    notes, next_cursor = ReadingNoteService.get_page(book, cursor)
+    html = render_to_string('reading/note_items.html', {'book': book, 'notes': notes}, request=request)
+
+    return JsonResponse({
+        'html': html,
+        'count': len(notes),
+        'next_cursor': next_cursor,
+    })
+
+
 @login_required
 def update_progress(request, book_id):
     if request.method == 'POST':
@@ -63,39 +128,29 @@ def update_progress(request, book_id):
             new_page = int(request.POST.get('current_page', 0))
             new_status = request.POST.get('status', 'reading')
 
-            if new_page < 0:
-                new_page = 0
-            elif new_page >= book.total_pages:
-                new_page = book.total_pages
-                new_status = 'completed'
+            with transaction.atomic():
+                # 같은 요청이 두 번 오거나 동시에 와도 증가분이 두 번 반영되지 않도록 행을 잠그고 다시 읽음
+                book = UserBook.objects.select_for_update().get(id=book.id)
 
-            old_page = book.current_page
-            pages_read = max(0, new_page - old_page)
+                if new_page < 0:
+                    new_page = 0
+                elif book.total_pages and new_page >= book.total_pages:
+                    # 페이지 수를 아직 모르는 책(total_pages=0)은 자동 완독 처리하지 않음
+                    new_page = book.total_pages
+                    new_status = 'completed'
+
+                pages_read = new_page - book.current_page
 
-            with transaction.atomic():
                 book.current_page = new_page
                 book.status = new_status
+                book.progress_updated_at = timezone.now()
                 book.save()
 
-                # 해바라기 성장 업데이트 (페이지 변경 시에만)
-                if pages_read != 0:  # 페이지가 변경된 경우 (증가 또는 감소)
-                    sunflower, created = SunflowerGrowth.objects.get_or_create(
-                        user=request.user,
-                        defaults={
-                            'total_pages_read': 0,
-                            'current_height_cm': 0,
-                            'level': 1
-                        }
-                    )
-
-                    # 실제 읽은 총 페이지 수 재계산
-                    user_books = UserBook.objects.filter(user=request.user)
-                    total_pages = sum(book_item.current_page for book_item in user_books)
+                # 해바라기 성장 업데이트 (페이지 변경 시에만, 증가 또는 감소)
+                SunflowerService.apply_page_delta(request.user, pages_read)
 
-                    sunflower.total_pages_read = total_pages
-                    sunflower.current_height_cm = Decimal(str(total_pages * 0.01))
-                    sunflower.level = max(1, int(total_pages / 100) + 1)
-                    sunflower.save()
+                # 통계용 독서 기록 추가
+                ReadingEventService.record(request.user, book, pages_read)
 
             if new_status == 'completed':
                 messages.success(request, f'🎉 축하합니다! "{book.book_title}"을 완독하셨습니다!')
@@ -120,24 +175,26 @@ def update_with_note(request, book_id):
 
             if new_page < 0:
                 new_page = 0
-            elif new_page >= book.total_pages:
+            elif book.total_pages and new_page >= book.total_pages:
                 new_page = book.total_pages
 
             # 메모가 있는 경우에만 유효성 검사
             has_note = note_content and note_content.strip()
             if has_note:
-                if note_page < 1 or note_page > book.total_pages:
+                if note_page < 1 or (book.total_pages and note_page > book.total_pages):
                     messages.error(request, f'노트 페이지는 1-{book.total_pages} 사이여야 합니다.')
                     return redirect('reading:detail', book_id=book_id)
 
-            old_page = book.current_page
-            pages_read = new_page - old_page
-
             with transaction.atomic():
+                # 같은 요청이 두 번 오거나 동시에 와도 증가분이 두 번 반영되지 않도록 행을 잠그고 다시 읽음
+                book = UserBook.objects.select_for_update().get(id=book.id)
+                pages_read = new_page - book.current_page
+
                 # 진행상황 업데이트
                 book.current_page = new_page
-                if new_page >= book.total_pages:
+                if book.total_pages and new_page >= book.total_pages:
                     book.status = 'completed'
+                book.progress_updated_at = timezone.now()
                 book.save()
 
                 # 노트 추가 (메모가 있는 경우에만)
@@ -149,23 +206,10 @@ def update_with_note(request, book_id):
                     )
 
                 # 해바라기 성장 업데이트
-                if pages_read != 0:
-                    sunflower, created = SunflowerGrowth.objects.get_or_create(
-                        user=request.user,
-                        defaults={
-                            'total_pages_read': 0,
-                            'current_height_cm': 0,
-                            'level': 1
-                        }
-                    )
+                SunflowerService.apply_page_delta(request.user, pages_read)
 
-                    user_books = UserBook.objects.filter(user=request.user)
-                    total_pages = sum(book_item.current_page for book_item in user_books)
-
-                    sunflower.total_pages_read = total_pages
-                    sunflower.current_height_cm = Decimal(str(total_pages * 0.01))
-                    sunflower.level = max(1, int(total_pages / 100) + 1)
-                    sunflower.save()
+                # 통계용 독서 기록 추가
+                ReadingEventService.record(request.user, book, pages_read)
 
             if book.status == 'completed':
                 if has_note:
@@ -195,7 +239,7 @@ def add_note(request, book_id):
         if page_number and note_content:
             try:
                 page_number = int(page_number)
-                if 1 <= page_number <= book.total_pages:
+                if page_number >= 1 and (not book.total_pages or page_number <= book.total_pages):
                     ReadingNote.objects.create(
                         user_book=book,
                         page_number=page_number,
@@ -233,25 +277,179 @@ def delete_book(request, book_id):
         book_title = book.book_title
 
         with transaction.atomic():
-            # 관련된 모든 노트도 함께 삭제됨 (CASCADE)
-            book.delete()
+            # 삭제 요청이 두 번 와도 한 번만 감소하도록 행을 잠그고 다시 읽음 (이미 지워졌으면 건너뜀)
+            book = UserBook.objects.select_for_update().filter(id=book.id).first()
+            if book is not None:
+                pages_read = book.current_page
 
-            # 해바라기 성장 업데이트 (책 삭제 후 총 페이지 수 재계산)
-            try:
-                sunflower = SunflowerGrowth.objects.get(user=request.user)
-                user_books = UserBook.objects.filter(user=request.user)
-                total_pages = sum(book_item.current_page for book_item in user_books)
-
-                sunflower.total_pages_read = total_pages
-                sunflower.current_height_cm = Decimal(str(total_pages * 0.01))
-                sunflower.level = max(1, int(total_pages / 100) + 1)
-                sunflower.save()
-            except SunflowerGrowth.DoesNotExist:
-                # 해바라기가 없는 경우는 무시
-                pass
+                # 관련된 모든 노트도 함께 삭제됨 (CASCADE)
+                book.delete()
+
+                # 해바라기 성장 업데이트 (삭제한 책에서 읽은 페이지만큼 감소)
+                SunflowerService.apply_page_delta(request.user, -pages_read)
 
         messages.success(request, f'"{book_title}" 책이 내 책장에서 삭제되었습니다.')
 
     return redirect('reading:my_books')
 
 
+def _get_stats_year(request):
+    try:
+        year = int(request.GET.get('year', ''))
+    except ValueError:
+        return timezone.localdate().year
+    if year < 2000 or year > 2100:
+        return timezone.localdate().year
+    return year
+
+
+@login_required
+def stats(request):
+    """독서 통계 페이지 (연간 히트맵, 월별 페이지 수)"""
+    year = _get_stats_year(request)
+    context = {
+        'stats': ReadingStatsService.get_stats(request.user, year),
+        'year': year,
+        'prev_year': year - 1,
+        'next_year': year + 1 if year < timezone.localdate().year else None,
+    }
+    return render(request, 'reading/stats.html', context)
+
+
+@login_required
+def api_stats(request):
+    """독서 통계 API (연간 집계 행 하나만 조회)"""
+    year = _get_stats_year(request)
+    return JsonResponse(ReadingStatsService.get_stats(request.user, year))
+
+
+def _search_notes(user, query):
+    notes = search_index.search(user, query, limit=20)
+    if notes is None:
+        # 전문 검색 인덱스를 쓸 수 없는 환경 (SQLite가 아닌 DB) 또는 한 글자 검색어
+        notes = list(
+            ReadingNote.objects.filter(user_book__user=user, note_content__icontains=query)
+            .select_related('user_book')
+            .order_by('-created_at')[:20]
+        )
+    return [
+        {'note': note, 'snippet': search_index.snippet(note.note_content, query)}
+        for note in notes
+    ]
+
+
+@login_required
+def note_search(request):
+    """내 모든 독서 노트 검색"""
+    query = request.GET.get('q', '').strip()
+    results = _search_notes(request.user, query) if query else []
+    return render(request, 'reading/note_search.html', {
+        'query': query,
+        'results': results,
+    })
+
+
+@login_required
+def api_note_search(request):
+    """독서 노트 검색 API"""
+    query = request.GET.get('q', '').strip()
+    results = _search_notes(request.user, query) if query else []
+    return JsonResponse({
+        'query': query,
+        'results': [
+            {
+                'id': result['note'].id,
+                'book_id': result['note'].user_book_id,
+                'book_title': result['note'].user_book.book_title,
+                'page_number': result['note'].page_number,
+                'snippet': result['snippet'],
+            }
+            for result in results
+        ],
+    })
+
+
+# 업로드 파일 최대 크기 (10MB)
+CLIPPINGS_MAX_FILE_SIZE = 10 * 1024 * 1024
+
+
+@login_required
+def import_clippings_view(request):
+    """전자책 하이라이트(My Clippings.txt)를 독서 노트로 가져오기"""
+    if request.method == 'POST':
+        upload = request.FILES.get('clippings_file')
+        if not upload:
+            messages.error(request, '하이라이트 파일을 선택해주세요.')
+            return redirect('reading:import_clippings')
+        if upload.size > CLIPPINGS_MAX_FILE_SIZE:
+            messages.error(request, '파일이 너무 큽니다. (최대 10MB)')
+            return redirect('reading:import_clippings')
+
+        try:
+            clippings = parse_clippings(decode_clippings(upload.read()))
+        except ClippingsImportError as e:
+            messages.error(request, str(e))
+            return redirect('reading:import_clippings')
+
+        result = import_clippings(request.user, clippings)
+        summary = f"{result['books']}권의 책에 노트 {result['created']}개를 가져왔습니다."
+        if result['points']:
+            summary += f" (+{result['points']}포인트)"
+        if result['duplicates']:
+            summary += f" 이미 있는 노트 {result['duplicates']}개는 건너뛰었습니다."
+        messages.success(request, summary)
+
+        if result['unmatched']:
+            titles = ', '.join(list(result['unmatched'])[:5])
+            messages.info(request, f'내 책장에서 찾지 못한 책: {titles} (책을 먼저 추가한 뒤 다시 가져와주세요)')
+        return redirect('reading:my_books')
+
+    return render(request, 'reading/import_clippings.html')
+
+
+@login_required
+@require_POST
+def api_sync(request):
+    """
+    모바일 앱 오프라인 동기화 API
+    {"operations": [{"key", "type": "progress"|"note", "book_id", "client_ts", ...}]}
+    """
+    try:
+        payload = json.loads(request.body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse({'error': '요청 본문이 올바른 JSON이 아닙니다.'}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({'error': '요청 본문은 JSON 객체여야 합니다.'}, status=400)
+
+    try:
+        results, books = apply_operations(request.user, payload.get('operations'))
+    except SyncError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'results': results,
+        'books': [
+            {
+                'id': book.id,
+                'current_page': book.current_page,
+                'total_pages': book.total_pages,
+                'status': book.status,
+                'updated_at': book.updated_at.isoformat(),
+            }
+            for book in books
+        ],
+    })
+
+
+@login_required
+def api_changes(request):
+    """
+    변경 피드 API: cursor 이후 바뀐 책/노트/독후감/포인트와 삭제된 항목만 반환
+    응답의 cursor를 다음 요청에 그대로 보내고, has_more가 True면 바로 이어서 요청
+    """
+    try:
+        since = parse_cursor(request.GET.get('cursor', ''))
+    except ValueError:
+        return JsonResponse({'error': '잘못된 커서입니다.'}, status=400)
+
+    return JsonResponse(get_changes(request.user, since))
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 import random
 import string
+from django.db.models import Sum
 from django.utils import timezone
 from .models import UserPoint, ReadingStreak, CafeCoupon, UserCoupon, PointHistory
 from reading.models import ReadingNote
@@ -51,10 +52,7 @@ class PointService:
         user_points, created = UserPoint.objects.get_or_create(user=user)
 
         # 해당 책의 노트 작성으로 이미 받은 포인트 확인
-        existing_note_points = PointHistory.objects.filter(
-            user=user,
-            reason__contains=f"'{user_book.book_title}' 독서노트"
-        ).count() * 2
+        existing_note_points = PointService.get_note_points(user, user_book)
 
         # 최대 50포인트까지만 지급
         if existing_note_points < 50:
@@ -62,6 +60,30 @@ class PointService:
             return True
         return False
 
+    @staticmethod
+    def award_note_points_bulk(user, user_book, note_count, source='가져오기'):
+        """
+        노트를 한꺼번에 가져온(source: 가져오기/동기화) 경우 책마다 포인트 내역 한 건으로 모아서 적립
+        (노트당 2포인트, 책당 최대 50포인트 규칙은 동일)
+        """
+        remaining = 50 - PointService.get_note_points(user, user_book)
+        points = min(note_count * 2, remaining)
+        if points <= 0:
+            return 0
+
+        user_points, created = UserPoint.objects.get_or_create(user=user)
+        user_points.add_points(points, f"'{user_book.book_title}' 독서노트 {note_count}개 {source}")
+        return points
+
+    @staticmethod
+    def get_note_points(user, user_book):
+        """해당 책의 독서노트로 이미 받은 포인트 합계"""
+        return PointHistory.objects.filter(
+            user=user,
+            transaction_type='earn',
+            reason__contains=f"'{user_book.book_title}' 독서노트"
+        ).aggregate(total=Sum('points'))['total'] or 0
+
 
 class CouponService:
     @staticmethod
@@ -1,8 +1,10 @@
+from django.conf import settings
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from books.models import UserBook
 from reading.models import ReadingNote
+from .models import UserPoint, ReadingStreak
 from .services import PointService
 
 
@@ -38,4 +40,12 @@ def award_note_points(sender, instance, created, **kwargs):
     if created:
         PointService.award_note_points(instance.user_book.user, instance.user_book)
         # 독서 활동으로 연속일 업데이트
-        PointService.update_reading_streak(instance.user_book.user)
\ No newline at end of file
+        PointService.update_reading_streak(instance.user_book.user)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_rewards(sender, instance, created, raw=False, **kwargs):
+    """회원가입 시 포인트/연속 독서 기록 생성 (조회 화면에서는 만들지 않음)"""
+    if created and not raw:
+        UserPoint.objects.get_or_create(user=instance)
+        ReadingStreak.objects.get_or_create(user=instance)
@@ -8,11 +8,20 @@ from .models import UserPoint, PointHistory, CafeCoupon, UserCoupon, ReadingStre
 from .services import CouponService
 
 
+def get_user_rewards(user):
+    """
+    포인트/연속 독서 기록 조회 (읽기 전용)
+    가입 시 만들어지므로 없으면 저장하지 않은 기본값을 사용
+    """
+    user_points = UserPoint.objects.filter(user=user).first() or UserPoint(user=user)
+    reading_streak = ReadingStreak.objects.filter(user=user).first() or ReadingStreak(user=user)
+    return user_points, reading_streak
+
+
 @login_required
 def points_dashboard(request):
     """포인트 대시보드"""
-    user_points, created = UserPoint.objects.get_or_create(user=request.user)
-    reading_streak, created = ReadingStreak.objects.get_or_create(user=request.user)
+    user_points, reading_streak = get_user_rewards(request.user)
 
     # 최근 포인트 내역
     point_history = PointHistory.objects.filter(user=request.user)[:10]
@@ -113,8 +122,7 @@ def use_coupon_page(request, coupon_code):
 @login_required
 def api_user_points(request):
     """사용자 포인트 정보 API"""
-    user_points, created = UserPoint.objects.get_or_create(user=request.user)
-    reading_streak, created = ReadingStreak.objects.get_or_create(user=request.user)
+    user_points, reading_streak = get_user_rewards(request.user)
 
     return JsonResponse({
         'total_points': user_points.total_points,
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SunflowerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sunflower'
+
+    def ready(self):
+        import sunflower.signals
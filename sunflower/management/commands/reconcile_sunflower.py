@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from sunflower.services import SunflowerService
+
+
+class Command(BaseCommand):
+    help = '해바라기 총 읽은 페이지 수를 책장 합계와 비교해서 바로잡음'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', default=None, help='특정 사용자(username)만 확인')
+        parser.add_argument('--dry-run', action='store_true', help='차이만 출력하고 수정하지 않음')
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            User = get_user_model()
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"사용자를 찾을 수 없습니다: {options['user']}")
+
+        drift = SunflowerService.reconcile(user=user, fix=not options['dry_run'])
+
+        for user_id, stored, actual in drift:
+            self.stdout.write(f'사용자 {user_id}: 저장값 {stored} -> 실제 {actual}')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'차이가 있는 사용자 {len(drift)}명 (수정하지 않음)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'해바라기 {len(drift)}명 보정 완료'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sunflower', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sunflowergrowth',
+            name='dashboard_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
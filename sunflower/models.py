@@ -7,5 +7,7 @@ class SunflowerGrowth(models.Model):
     total_pages_read = models.PositiveIntegerField(default=0)
     current_height_cm = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     level = models.PositiveIntegerField(default=1)
+    # 홈 대시보드 조각 캐시 버전 (캐시에서 밀려나도 초기화되지 않도록 DB에 보관)
+    dashboard_version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,167 @@
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum, Value, DecimalField, IntegerField
+from django.db.models.functions import Cast, Greatest
+from django.template.loader import render_to_string
+from django.utils import timezone
+import time
+from books.models import UserBook
+from .models import SunflowerGrowth
+
+
+# 1페이지당 0.01cm 성장, 100페이지마다 레벨업
+CM_PER_PAGE = Decimal('0.01')
+PAGES_PER_LEVEL = 100
+
+
+class SunflowerService:
+    @staticmethod
+    def derive(total_pages):
+        """총 읽은 페이지 수로 키(cm)와 레벨 계산"""
+        height = Decimal(total_pages) * CM_PER_PAGE
+        level = max(1, total_pages // PAGES_PER_LEVEL + 1)
+        return height, level
+
+    @staticmethod
+    def apply_page_delta(user, delta):
+        """
+        읽은 페이지 변화량만큼 해바라기를 성장(또는 감소)시킴
+        전체 책장을 다시 합산하지 않고 UPDATE 한 번으로 처리
+        """
+        if not delta:
+            return
+
+        SunflowerGrowth.objects.get_or_create(user=user)
+
+        new_total = Greatest(F('total_pages_read') + Value(delta), Value(0), output_field=IntegerField())
+        SunflowerGrowth.objects.filter(user=user).update(
+            total_pages_read=new_total,
+            current_height_cm=Cast(new_total, DecimalField(max_digits=10, decimal_places=2)) * CM_PER_PAGE,
+            level=new_total / PAGES_PER_LEVEL + 1,
+            updated_at=timezone.now(),
+        )
+
+    @staticmethod
+    def reconcile(user=None, fix=True):
+        """
+        책장의 current_page 합계(SUM 쿼리 한 번)와 저장된 total_pages_read 비교
+        차이가 있는 사용자 목록 [(user_id, 저장값, 실제값)] 반환, fix=True면 바로잡음
+        """
+        books = UserBook.objects.all()
+        growths = SunflowerGrowth.objects.all()
+        if user is not None:
+            books = books.filter(user=user)
+            growths = growths.filter(user=user)
+
+        actual = dict(
+            books.values('user').annotate(total=Sum('current_page')).values_list('user', 'total')
+        )
+        stored = dict(growths.values_list('user', 'total_pages_read'))
+
+        drift = []
+        for user_id in actual.keys() | stored.keys():
+            actual_total = actual.get(user_id) or 0
+            stored_total = stored.get(user_id)
+            if stored_total is None and actual_total == 0:
+                continue
+            if stored_total != actual_total:
+                drift.append((user_id, stored_total, actual_total))
+
+        if fix:
+            for user_id, stored_total, actual_total in drift:
+                height, level = SunflowerService.derive(actual_total)
+                SunflowerGrowth.objects.update_or_create(
+                    user_id=user_id,
+                    defaults={
+                        'total_pages_read': actual_total,
+                        'current_height_cm': height,
+                        'level': level,
+                    }
+                )
+                DashboardService.invalidate(user_id)
+        return drift
+
+
+class DashboardService:
+    """
+    홈 화면 대시보드 조각을 사용자별로 캐시
+    캐시 키에 사용자별 버전(SunflowerGrowth.dashboard_version)을 넣고, 책장/노트가 바뀌면 버전을 올려서 무효화
+    """
+    FRAGMENT_KEY = 'sunflower:dashboard:{}:v{}'
+    HITS_KEY = 'sunflower:dashboard:hits'
+    MISSES_KEY = 'sunflower:dashboard:misses'
+    RENDER_US_KEY = 'sunflower:dashboard:render_us'
+
+    @staticmethod
+    def render(user):
+        version = SunflowerGrowth.objects.filter(user=user).values_list('dashboard_version', flat=True).first() or 0
+        key = DashboardService.FRAGMENT_KEY.format(user.id, version)
+
+        html = cache.get(key)
+        if html is not None:
+            DashboardService._incr(DashboardService.HITS_KEY)
+            return html
+
+        DashboardService._incr(DashboardService.MISSES_KEY)
+        started = time.perf_counter()
+        html = render_to_string('sunflower/dashboard.html', DashboardService.get_context(user))
+        elapsed_us = int((time.perf_counter() - started) * 1000000)
+        DashboardService._incr(DashboardService.RENDER_US_KEY, elapsed_us)
+
+        cache.set(key, html, getattr(settings, 'SUNFLOWER_DASHBOARD_CACHE_TTL', 3600))
+        return html
+
+    @staticmethod
+    def get_context(user):
+        # 해바라기는 가입 시 만들어짐, 없으면 저장하지 않은 기본값으로 표시 (쓰기 없음)
+        sunflower = SunflowerGrowth.objects.filter(user=user).first() or SunflowerGrowth(user=user)
+
+        # 상태별 권수를 조건부 집계 쿼리 한 번으로 계산
+        counts = UserBook.objects.filter(user=user).aggregate(
+            reading_books=Count('id', filter=Q(status='reading')),
+            completed_books=Count('id', filter=Q(status='completed')),
+        )
+
+        # 카드에 필요한 컬럼만 읽고 진행률은 SQL에서 계산
+        recent_books = list(UserBook.objects.filter(
+            user=user,
+            status__in=['reading', 'completed']
+        ).shelf_cards().order_by('-updated_at')[:3])
+
+        return {
+            'sunflower': sunflower,
+            'recent_books': recent_books,
+            'reading_books': counts['reading_books'],
+            'completed_books': counts['completed_books'],
+        }
+
+    @staticmethod
+    def invalidate(user_id):
+        updated = SunflowerGrowth.objects.filter(user_id=user_id).update(
+            dashboard_version=F('dashboard_version') + 1,
+        )
+        if not updated:
+            # 해바라기가 아직 없으면 버전 0(기본값 화면)과 겹치지 않게 1로 만듦
+            SunflowerGrowth.objects.get_or_create(user_id=user_id, defaults={'dashboard_version': 1})
+
+    @staticmethod
+    def stats():
+        hits = cache.get(DashboardService.HITS_KEY, 0)
+        misses = cache.get(DashboardService.MISSES_KEY, 0)
+        render_us = cache.get(DashboardService.RENDER_US_KEY, 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 3) if total else 0.0,
+            'avg_render_ms': round(render_us / misses / 1000, 2) if misses else 0.0,
+        }
+
+    @staticmethod
+    def _incr(key, delta=1):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.add(key, 0, None)
+            cache.incr(key, delta)
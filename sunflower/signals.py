@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from books.models import UserBook
+from reading.models import ReadingNote
+from .models import SunflowerGrowth
+from .services import DashboardService
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_sunflower(sender, instance, created, raw=False, **kwargs):
+    """회원가입 시 해바라기 생성 (조회 화면에서는 만들지 않음)"""
+    if created and not raw:
+        SunflowerGrowth.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=UserBook)
+@receiver(post_delete, sender=UserBook)
+def invalidate_dashboard_for_book(sender, instance, **kwargs):
+    """책장이 바뀌면 홈 대시보드 캐시 무효화 (커밋 전에 올리면 이전 데이터가 새 버전으로 캐시될 수 있음)"""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: DashboardService.invalidate(user_id))
+
+
+@receiver(post_save, sender=ReadingNote)
+@receiver(post_delete, sender=ReadingNote)
+def invalidate_dashboard_for_note(sender, instance, **kwargs):
+    """독서 노트가 바뀌면 홈 대시보드 캐시 무효화 (커밋 후)"""
+    user_id = instance.user_book.user_id
+    transaction.on_commit(lambda: DashboardService.invalidate(user_id))
@@ -1,3 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rewards.models import UserPoint, ReadingStreak
+from .models import SunflowerGrowth
 
-# Create your tests here.
+
+WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class ReadOnlyGetViewsTest(TestCase):
+    """조회 화면(GET)은 DB에 쓰지 않아야 함"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='reader', password='pass1234', nickname='독자')
+        self.client.force_login(self.user)
+
+    def assertNoWrites(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        writes = [q['sql'] for q in queries.captured_queries if q['sql'].lstrip().upper().startswith(WRITE_PREFIXES)]
+        self.assertEqual(writes, [])
+
+    def test_signup_creates_rows(self):
+        self.assertTrue(SunflowerGrowth.objects.filter(user=self.user).exists())
+        self.assertTrue(UserPoint.objects.filter(user=self.user).exists())
+        self.assertTrue(ReadingStreak.objects.filter(user=self.user).exists())
+
+    def test_get_views_do_not_write(self):
+        for name in ('sunflower:home', 'rewards:dashboard', 'rewards:api_user_points'):
+            with self.subTest(view=name):
+                self.assertNoWrites(reverse(name))
+
+    def test_get_views_do_not_write_without_rows(self):
+        # backfill_user_rows 실행 전의 기존 사용자
+        SunflowerGrowth.objects.filter(user=self.user).delete()
+        UserPoint.objects.filter(user=self.user).delete()
+        ReadingStreak.objects.filter(user=self.user).delete()
+
+        for name in ('sunflower:home', 'rewards:dashboard', 'rewards:api_user_points'):
+            with self.subTest(view=name):
+                self.assertNoWrites(reverse(name))
+        self.assertFalse(SunflowerGrowth.objects.filter(user=self.user).exists())